@@ -16,18 +16,8 @@ branch_labels = None
 depends_on = None
 
 def upgrade():
-    # Create agent_memory table
-    op.create_table(
-        'agent_memory',
-        sa.Column('id', sa.Integer(), nullable=False),
-        sa.Column('agent_id', sa.String(), nullable=False),
-        sa.Column('memory_type', sa.String(), nullable=False),
-        sa.Column('content', postgresql.JSONB(), nullable=False),
-        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
-        sa.PrimaryKeyConstraint('id')
-    )
-    op.create_index('ix_agent_memory_agent_id', 'agent_memory', ['agent_id'])
-    op.create_index('ix_agent_memory_memory_type', 'agent_memory', ['memory_type'])
+    # agent_memory is owned by 20240608_memory_sync; both roots are joined
+    # by 137e54e616bd, so creating it here too would fail on a fresh install.
 
     # Create agent_message table
     op.create_table(
@@ -44,6 +34,11 @@ def upgrade():
     op.create_index('ix_agent_message_receiver_id', 'agent_message', ['receiver_id'])
     op.create_index('ix_agent_message_message_type', 'agent_message', ['message_type'])
 
+    # jsonb_path_ops GIN supports @> containment at about half the size of
+    # jsonb_ops; built CONCURRENTLY, which cannot run in a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agent_message_content_gin ON agent_message USING GIN (content jsonb_path_ops)")
+
 def downgrade():
-    op.drop_table('agent_message')
-    op.drop_table('agent_memory') 
\ No newline at end of file
+    op.execute("DROP INDEX IF EXISTS ix_agent_message_content_gin")
+    op.drop_table('agent_message')
\ No newline at end of file
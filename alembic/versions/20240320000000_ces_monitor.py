@@ -36,7 +36,12 @@ def upgrade():
         sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP'))
     )
     op.create_index('ix_sensor_metrics_sensor_id', 'sensor_metrics', ['sensor_id'])
-    op.create_index('ix_sensor_metrics_timestamp', 'sensor_metrics', ['timestamp'])
+    # Metrics are appended in time order, so a BRIN block-range summary gives
+    # the same range-scan plan as a btree at a fraction of the size
+    op.execute(
+        "CREATE INDEX ix_sensor_metrics_timestamp ON sensor_metrics "
+        "USING BRIN (timestamp) WITH (pages_per_range = 32)"
+    )
 
     # Create model_status table
     op.create_table(
@@ -15,35 +15,36 @@ branch_labels = None
 depends_on = None
 
 def upgrade():
-    # 1. Add tenant_id columns (nullable for now)
+    # 1. Add tenant_id columns, backfill via constant default, then drop the
+    #    default - one ALTER TABLE per table (metadata-only on Postgres 11+)
     tables = ["sensors", "sensor_metrics", "model_status", "retraining_jobs"]
     for table in tables:
-        op.add_column(
-            table,
-            sa.Column('tenant_id', sa.String(length=64), nullable=True, server_default='scout')
+        op.execute(
+            f"ALTER TABLE {table} "
+            f"ADD COLUMN tenant_id VARCHAR(64) NOT NULL DEFAULT 'scout', "
+            f"ALTER COLUMN tenant_id DROP DEFAULT;"
         )
-        # Create index on tenant_id
-        op.create_index(f'ix_{table}_tenant_id', table, ['tenant_id'])
 
-    # 2. Make tenant_id non-nullable after backfill
-    for table in tables:
-        op.alter_column(
-            table,
-            'tenant_id',
-            nullable=False,
-            server_default=None  # Remove the default after making non-nullable
-        )
+    # 2. Create tenant_id indexes without blocking writers; CONCURRENTLY
+    #    cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for table in tables:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_tenant_id ON {table} (tenant_id)"
+            )
 
     # 3. Enable RLS and create policy for each table
     for table in tables:
         # Enable row level security
         op.execute(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;')
+        # Apply policies to the table owner too, not just other roles
+        op.execute(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY;')
         # Create enforce_tenant policy
         op.execute(
             f"""
             CREATE POLICY enforce_tenant_{table}
               ON {table}
-              USING ( tenant_id = current_setting('app.current_tenant', true) );
+              USING ( tenant_id = (SELECT current_setting('app.current_tenant', true)) );
             """
         )
 
@@ -52,6 +53,7 @@ def downgrade():
     tables = ["sensors", "sensor_metrics", "model_status", "retraining_jobs"]
     for table in tables:
         op.execute(f'DROP POLICY IF EXISTS enforce_tenant_{table} ON {table};')
+        op.execute(f'ALTER TABLE {table} NO FORCE ROW LEVEL SECURITY;')
         op.execute(f'ALTER TABLE {table} DISABLE ROW LEVEL SECURITY;')
 
     # 2. Drop indexes and columns
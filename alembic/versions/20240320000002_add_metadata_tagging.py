@@ -25,7 +25,6 @@ def upgrade():
         sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
         sa.Column('tenant_id', sa.String(length=64), nullable=False)  # Add tenant_id for RLS
     )
-    op.create_index('ix_tags_tenant_id', 'tags', ['tenant_id'])
 
     # 2. campaign_tags association
     op.create_table(
@@ -37,7 +36,6 @@ def upgrade():
         sa.UniqueConstraint('campaign_id', 'tag_id', name='uq_campaign_tag')
     )
     op.create_index('ix_campaign_tags_tag_id', 'campaign_tags', ['tag_id'])
-    op.create_index('ix_campaign_tags_tenant_id', 'campaign_tags', ['tenant_id'])
 
     # 3. asset_tags association
     op.create_table(
@@ -49,16 +47,25 @@ def upgrade():
         sa.UniqueConstraint('asset_id', 'tag_id', name='uq_asset_tag')
     )
     op.create_index('ix_asset_tags_tag_id', 'asset_tags', ['tag_id'])
-    op.create_index('ix_asset_tags_tenant_id', 'asset_tags', ['tenant_id'])
+
+    # tenant_id indexes are built without blocking writers; CONCURRENTLY
+    # cannot run inside a transaction block
+    with op.get_context().autocommit_block():
+        for table in ['tags', 'campaign_tags', 'asset_tags']:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_tenant_id ON {table} (tenant_id)"
+            )
 
     # Enable RLS and create policies for new tables
     for table in ['tags', 'campaign_tags', 'asset_tags']:
         op.execute(f'ALTER TABLE {table} ENABLE ROW LEVEL SECURITY;')
+        # Apply policies to the table owner too, not just other roles
+        op.execute(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY;')
         op.execute(
             f"""
             CREATE POLICY enforce_tenant_{table}
               ON {table}
-              USING ( tenant_id = current_setting('app.current_tenant', true) );
+              USING ( tenant_id = (SELECT current_setting('app.current_tenant', true)) );
             """
         )
 
@@ -67,6 +74,7 @@ def downgrade():
     # Drop RLS policies first
     for table in ['tags', 'campaign_tags', 'asset_tags']:
         op.execute(f'DROP POLICY IF EXISTS enforce_tenant_{table} ON {table};')
+        op.execute(f'ALTER TABLE {table} NO FORCE ROW LEVEL SECURITY;')
         op.execute(f'ALTER TABLE {table} DISABLE ROW LEVEL SECURITY;')
 
     # Drop tables in reverse order
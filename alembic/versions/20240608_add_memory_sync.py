@@ -44,6 +44,14 @@ def upgrade():
     op.create_index('ix_agent_communication_sender_id', 'agent_communication', ['sender_id'])
     op.create_index('ix_agent_communication_receiver_id', 'agent_communication', ['receiver_id'])
 
+    # jsonb_path_ops GIN supports @> containment at about half the size of
+    # jsonb_ops; built CONCURRENTLY, which cannot run in a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agent_memory_content_gin ON agent_memory USING GIN (content jsonb_path_ops)")
+        op.execute("CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agent_communication_content_gin ON agent_communication USING GIN (content jsonb_path_ops)")
+
 def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_agent_communication_content_gin")
+    op.execute("DROP INDEX IF EXISTS ix_agent_memory_content_gin")
     op.drop_table('agent_communication')
     op.drop_table('agent_memory') 
\ No newline at end of file
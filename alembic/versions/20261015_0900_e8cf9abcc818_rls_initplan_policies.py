@@ -0,0 +1,47 @@
+"""Recreate tenant RLS policies with InitPlan subquery
+
+Revision ID: e8cf9abcc818
+Revises: 137e54e616bd
+Create Date: 2026-10-15 09:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8cf9abcc818'
+down_revision = '137e54e616bd'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    "sensors", "sensor_metrics", "model_status", "retraining_jobs",
+    "tags", "campaign_tags", "asset_tags"
+]
+
+
+def upgrade():
+    # Wrapping current_setting() in a scalar subquery lets the planner
+    # evaluate it once per query (InitPlan) instead of once per row.
+    for table in TABLES:
+        op.execute(f'DROP POLICY IF EXISTS enforce_tenant_{table} ON {table};')
+        op.execute(
+            f"""
+            CREATE POLICY enforce_tenant_{table}
+              ON {table}
+              USING ( tenant_id = (SELECT current_setting('app.current_tenant', true)) );
+            """
+        )
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f'DROP POLICY IF EXISTS enforce_tenant_{table} ON {table};')
+        op.execute(
+            f"""
+            CREATE POLICY enforce_tenant_{table}
+              ON {table}
+              USING ( tenant_id = current_setting('app.current_tenant', true) );
+            """
+        )
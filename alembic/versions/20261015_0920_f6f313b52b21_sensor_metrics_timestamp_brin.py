@@ -0,0 +1,42 @@
+"""Convert sensor_metrics timestamp index to BRIN
+
+Revision ID: f6f313b52b21
+Revises: e8cf9abcc818
+Create Date: 2026-10-15 09:20:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6f313b52b21'
+down_revision = 'e8cf9abcc818'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Fresh installs already get the BRIN index from the initial revision
+    indexdef = op.get_bind().execute(sa.text(
+        "SELECT indexdef FROM pg_indexes WHERE indexname = 'ix_sensor_metrics_timestamp'"
+    )).scalar()
+    if indexdef and "USING brin" in indexdef:
+        return
+
+    # Replace the btree built by earlier deployments without blocking
+    # sensor_metrics writers; CONCURRENTLY cannot run in a transaction block
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sensor_metrics_timestamp")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_sensor_metrics_timestamp ON sensor_metrics "
+            "USING BRIN (timestamp) WITH (pages_per_range = 32)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sensor_metrics_timestamp")
+        op.execute(
+            "CREATE INDEX CONCURRENTLY ix_sensor_metrics_timestamp ON sensor_metrics (timestamp)"
+        )
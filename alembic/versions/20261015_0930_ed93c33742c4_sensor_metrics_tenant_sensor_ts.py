@@ -0,0 +1,42 @@
+"""Add composite tenant/sensor/timestamp index on sensor_metrics
+
+Revision ID: ed93c33742c4
+Revises: f6f313b52b21
+Create Date: 2026-10-15 09:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ed93c33742c4'
+down_revision = 'f6f313b52b21'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Every query carries the RLS tenant_id predicate on top of the
+    # sensor/time filter; one composite index serves both in a single range
+    # scan and covers tenant-prefix lookups, so the single-column indexes go.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sensor_metrics_tenant_sensor_ts "
+            "ON sensor_metrics (tenant_id, sensor_id, timestamp DESC)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sensor_metrics_sensor_id")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sensor_metrics_tenant_id")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sensor_metrics_tenant_id "
+            "ON sensor_metrics (tenant_id)"
+        )
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sensor_metrics_sensor_id "
+            "ON sensor_metrics (sensor_id)"
+        )
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sensor_metrics_tenant_sensor_ts")
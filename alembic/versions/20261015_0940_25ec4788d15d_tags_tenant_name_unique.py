@@ -0,0 +1,31 @@
+"""Add unique (tenant_id, name) index on tags
+
+Revision ID: 25ec4788d15d
+Revises: ed93c33742c4
+Create Date: 2026-10-15 09:40:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '25ec4788d15d'
+down_revision = 'ed93c33742c4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Tag-by-name lookups always carry the RLS tenant predicate, so lead with
+    # tenant_id to keep them an index-only scan.
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS ux_tags_tenant_name "
+            "ON tags (tenant_id, name)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ux_tags_tenant_name")
@@ -0,0 +1,31 @@
+"""Add trigram index on tags.name for substring search
+
+Revision ID: ae919d687d12
+Revises: 25ec4788d15d
+Create Date: 2026-10-15 09:50:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'ae919d687d12'
+down_revision = '25ec4788d15d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # ILIKE '%term%' can't use a btree; a trigram GIN index can
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_tags_name_trgm "
+            "ON tags USING GIN (name gin_trgm_ops)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_tags_name_trgm")
@@ -0,0 +1,52 @@
+"""Force tenant RLS and add non-owner app_runtime role
+
+Revision ID: aa67a1dc6882
+Revises: ae919d687d12
+Create Date: 2026-10-15 10:00:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'aa67a1dc6882'
+down_revision = 'ae919d687d12'
+branch_labels = None
+depends_on = None
+
+TABLES = [
+    "sensors", "sensor_metrics", "model_status", "retraining_jobs",
+    "tags", "campaign_tags", "asset_tags"
+]
+
+
+def upgrade():
+    # ENABLE alone is bypassed by the table owner; FORCE applies the tenant
+    # policies to every role except superusers (i.e. migration connections).
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} FORCE ROW LEVEL SECURITY;')
+
+    # The API should connect as (or SET ROLE to) this non-owner role
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF NOT EXISTS (SELECT 1 FROM pg_roles WHERE rolname = 'app_runtime') THEN
+                CREATE ROLE app_runtime NOLOGIN;
+            END IF;
+        END
+        $$;
+        """
+    )
+    for table in TABLES:
+        op.execute(f'GRANT SELECT, INSERT, UPDATE, DELETE ON {table} TO app_runtime;')
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f'REVOKE ALL ON {table} FROM app_runtime;')
+    op.execute('DROP ROLE IF EXISTS app_runtime;')
+
+    for table in TABLES:
+        op.execute(f'ALTER TABLE {table} NO FORCE ROW LEVEL SECURITY;')
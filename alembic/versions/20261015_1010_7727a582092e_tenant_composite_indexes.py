@@ -0,0 +1,53 @@
+"""Replace single-column tenant_id indexes with composite/partial indexes
+
+Revision ID: 7727a582092e
+Revises: aa67a1dc6882
+Create Date: 2026-10-15 10:10:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7727a582092e'
+down_revision = 'aa67a1dc6882'
+branch_labels = None
+depends_on = None
+
+# index name -> definition; each leads with tenant_id so it also serves the
+# RLS predicate on its own. retraining_jobs.status holds RetrainingStatus
+# member names, which is what SQLAlchemy's Enum type persists.
+COMPOSITE_INDEXES = {
+    'ix_model_status_tenant_updated':
+        'ON model_status (tenant_id, updated_at DESC)',
+    'ix_retraining_jobs_tenant_created':
+        'ON retraining_jobs (tenant_id, created_at DESC)',
+    'ix_retraining_jobs_tenant_status_active':
+        "ON retraining_jobs (tenant_id, status) WHERE status IN ('PENDING', 'RUNNING')",
+    'ix_campaign_tags_tenant_tag':
+        'ON campaign_tags (tenant_id, tag_id)',
+    'ix_asset_tags_tenant_tag':
+        'ON asset_tags (tenant_id, tag_id)',
+}
+
+# Covered by the composites above, or by ux_tags_tenant_name for tags
+REDUNDANT_TABLES = ['model_status', 'retraining_jobs', 'campaign_tags', 'asset_tags', 'tags']
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, definition in COMPOSITE_INDEXES.items():
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+        for table in REDUNDANT_TABLES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS ix_{table}_tenant_id")
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in REDUNDANT_TABLES:
+            op.execute(
+                f"CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_{table}_tenant_id ON {table} (tenant_id)"
+            )
+        for name in COMPOSITE_INDEXES:
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,31 @@
+"""Add (tenant_id, timestamp DESC) index on sensor_metrics
+
+Revision ID: 23898fa62f0b
+Revises: 7727a582092e
+Create Date: 2026-10-15 10:20:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '23898fa62f0b'
+down_revision = '7727a582092e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Metric history filters on the RLS tenant plus a time window across all
+    # sensors, which the (tenant_id, sensor_id, timestamp) index can't range-scan
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_sensor_metrics_tenant_ts "
+            "ON sensor_metrics (tenant_id, timestamp DESC)"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_sensor_metrics_tenant_ts")
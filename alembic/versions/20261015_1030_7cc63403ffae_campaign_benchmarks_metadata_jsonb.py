@@ -0,0 +1,43 @@
+"""Convert campaign_benchmarks.metadata to JSONB with a GIN index
+
+Revision ID: 7cc63403ffae
+Revises: 23898fa62f0b
+Create Date: 2026-10-15 10:30:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7cc63403ffae'
+down_revision = '23898fa62f0b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # campaign_benchmarks is created by scripts/validate_benchmarks.py via
+    # create_all, so only convert it where it already exists
+    if not sa.inspect(op.get_bind()).has_table('campaign_benchmarks'):
+        return
+    op.execute(
+        "ALTER TABLE campaign_benchmarks "
+        "ALTER COLUMN metadata TYPE jsonb USING metadata::jsonb"
+    )
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_benchmarks_meta_gin "
+            "ON campaign_benchmarks USING GIN (metadata)"
+        )
+
+
+def downgrade():
+    if not sa.inspect(op.get_bind()).has_table('campaign_benchmarks'):
+        return
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_benchmarks_meta_gin")
+    op.execute(
+        "ALTER TABLE campaign_benchmarks "
+        "ALTER COLUMN metadata TYPE json USING metadata::json"
+    )
@@ -0,0 +1,44 @@
+"""Add campaign_benchmarks and agent_memory lookup indexes
+
+Revision ID: 08eef5d9280e
+Revises: 7cc63403ffae
+Create Date: 2026-10-15 10:40:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '08eef5d9280e'
+down_revision = '7cc63403ffae'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    has_benchmarks = sa.inspect(op.get_bind()).has_table('campaign_benchmarks')
+    with op.get_context().autocommit_block():
+        # get_memories filters on agent_id (and optionally memory_type)
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agent_memory_agent_type "
+            "ON agent_memory (agent_id, memory_type, created_at DESC)"
+        )
+        # campaign_benchmarks comes from create_all in
+        # scripts/validate_benchmarks.py; index it where it already exists
+        if has_benchmarks:
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cb_campaign_date "
+                "ON campaign_benchmarks (campaign_id, date DESC)"
+            )
+            op.execute(
+                "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_cb_ctype "
+                "ON campaign_benchmarks (campaign_id, benchmark_type, date DESC)"
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_cb_ctype")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_cb_campaign_date")
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_agent_memory_agent_type")
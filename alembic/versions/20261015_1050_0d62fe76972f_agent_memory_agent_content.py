@@ -0,0 +1,31 @@
+"""Add agent_memory (agent_id, content ->> 'content') index
+
+Revision ID: 0d62fe76972f
+Revises: 08eef5d9280e
+Create Date: 2026-10-15 10:50:00.000000+00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0d62fe76972f'
+down_revision = '08eef5d9280e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # MemoryService.exists_with_content probes a message's text per agent;
+    # an index seek replaces scanning and decoding the agent's history
+    with op.get_context().autocommit_block():
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_agent_memory_agent_content "
+            "ON agent_memory (agent_id, (content ->> 'content'))"
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.execute("DROP INDEX CONCURRENTLY IF EXISTS ix_agent_memory_agent_content")
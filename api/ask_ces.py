@@ -1,11 +1,14 @@
 #!/usr/bin/env python3
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import bindparam, text
 from sqlalchemy.orm import Session
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel
-from datetime import datetime
+from sqlalchemy.sql.elements import TextClause
+from typing import List, Optional, Dict, Any, Tuple
+from pydantic import BaseModel, Field
+from datetime import datetime, timezone
 import json
 from pathlib import Path
+from statistics import fmean
 
 from ..db import get_db
 from ..schemas.dashboard import (
@@ -15,6 +18,32 @@ from ..schemas.dashboard import (
 
 router = APIRouter(prefix="/ask", tags=["ask"])
 
+# Built once at import; filter values travel as bound parameters so the
+# compiled statement and the server-side plan are reused across requests.
+CAMPAIGN_EFFECTIVENESS_SQL = text("""
+    SELECT
+        c.campaign_id,
+        c.name AS campaign_name,
+        COUNT(at.asset_id) AS num_assets,
+        AVG(f.effectiveness_score) AS avg_effectiveness
+    FROM campaigns c
+    JOIN campaign_tags ct ON ct.campaign_id = c.campaign_id
+    JOIN tags t ON t.tag_id = ct.tag_id
+    LEFT JOIN asset_tags at ON at.tag_id = t.tag_id
+    LEFT JOIN features f ON f.asset_id = at.asset_id
+    WHERE t.name IN :tag_names
+    GROUP BY c.campaign_id, c.name
+    ORDER BY avg_effectiveness DESC
+    LIMIT 5
+""").bindparams(bindparam("tag_names", expanding=True))
+
+NARRATIVE_TEMPLATE = (
+    "Found {count:.0f} campaigns matching your criteria. "
+    "The average effectiveness score is {avg_effectiveness:.2f}. "
+    "Top performing campaign: {top_name} with {top_assets} assets."
+)
+NO_RESULTS_NARRATIVE = "No campaigns matched your criteria."
+
 class QueryRequest(BaseModel):
     """Natural language query request."""
     question: str
@@ -29,7 +58,7 @@ class QueryResponse(BaseModel):
     charts: List[DashboardChart]
     metrics: List[DashboardMetric]
     raw_data: Optional[Dict[str, Any]] = None
-    timestamp: datetime = datetime.utcnow()
+    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 @router.post("/", response_model=QueryResponse)
 async def ask_ces(
@@ -42,10 +71,10 @@ async def ask_ces(
         intent = _parse_query_intent(request.question)
         
         # 2. Generate SQL
-        sql = _generate_sql(intent, request.filters)
+        stmt, params = _generate_sql(intent, request.filters)
         
         # 3. Execute query
-        results = _execute_query(db, sql)
+        results = _execute_query(db, stmt, params)
         
         # 4. Generate visualizations
         charts = _create_charts(intent, results)
@@ -58,11 +87,10 @@ async def ask_ces(
         
         return QueryResponse(
             answer=answer,
-            sql=sql,
+            sql=_render_sql(db, stmt, params),
             charts=charts,
             metrics=metrics,
-            raw_data=results,
-            timestamp=datetime.utcnow()
+            raw_data=results
         )
         
     except Exception as e:
@@ -81,39 +109,27 @@ def _parse_query_intent(question: str) -> Dict[str, Any]:
         "time_range": "month"
     }
 
-def _generate_sql(intent: Dict[str, Any], filters: Optional[Dict[str, Any]]) -> str:
-    """Generate SQL from parsed intent."""
+def _generate_sql(
+    intent: Dict[str, Any],
+    filters: Optional[Dict[str, Any]]
+) -> Tuple[TextClause, Dict[str, Any]]:
+    """Generate a parameterized SQL statement from parsed intent."""
     # TODO: Implement GPT-based SQL generation
-    return """
-    SELECT
-        c.campaign_id,
-        c.name AS campaign_name,
-        COUNT(at.asset_id) AS num_assets,
-        AVG(f.effectiveness_score) AS avg_effectiveness
-    FROM campaigns c
-    JOIN campaign_tags ct ON ct.campaign_id = c.campaign_id
-    JOIN tags t ON t.tag_id = ct.tag_id
-    LEFT JOIN asset_tags at ON at.tag_id = t.tag_id
-    LEFT JOIN features f ON f.asset_id = at.asset_id
-    WHERE t.name IN ('brand_awareness', 'mothers', 'mindanao')
-    GROUP BY c.campaign_id, c.name
-    ORDER BY avg_effectiveness DESC
-    LIMIT 5
-    """
+    return CAMPAIGN_EFFECTIVENESS_SQL, {"tag_names": intent["filters"]}
 
-def _execute_query(db: Session, sql: str) -> Dict[str, Any]:
+def _execute_query(db: Session, stmt: TextClause, params: Dict[str, Any]) -> Dict[str, Any]:
     """Execute SQL query and return results."""
-    # TODO: Implement safe query execution
-    return {
-        "campaigns": [
-            {
-                "campaign_id": "123",
-                "campaign_name": "Sample Campaign",
-                "num_assets": 42,
-                "avg_effectiveness": 0.85
-            }
-        ]
-    }
+    # Server-side cursor keeps memory bounded once the LIMIT is lifted
+    result = db.execute(stmt.execution_options(stream_results=True), params)
+    return {"campaigns": [dict(row) for row in result.mappings()]}
+
+def _render_sql(db: Session, stmt: TextClause, params: Dict[str, Any]) -> str:
+    """SQL for display, with expanding IN lists spelled out as one placeholder per value."""
+    compiled = stmt.bindparams(**params).compile(
+        dialect=db.bind.dialect,
+        compile_kwargs={"render_postcompile": True}
+    )
+    return str(compiled)
 
 def _create_charts(intent: Dict[str, Any], results: Dict[str, Any]) -> List[DashboardChart]:
     """Create visualization charts based on results."""
@@ -149,37 +165,32 @@ def _create_charts(intent: Dict[str, Any], results: Dict[str, Any]) -> List[Dash
 
 def _calculate_metrics(intent: Dict[str, Any], results: Dict[str, Any]) -> List[DashboardMetric]:
     """Calculate key metrics from results."""
-    metrics = []
+    campaigns = results["campaigns"]
+    num_campaigns = len(campaigns)
+    avg_effectiveness = (
+        fmean(c["avg_effectiveness"] or 0.0 for c in campaigns)
+        if num_campaigns else 0.0
+    )
+    now = datetime.utcnow()
     
-    # Add total campaigns metric
-    metrics.append(
+    return [
         DashboardMetric(
             id="total_campaigns",
             name="Total Campaigns",
             description="Number of matching campaigns",
             type=MetricType.COUNT,
-            value=len(results["campaigns"]),
-            last_updated=datetime.utcnow()
-        )
-    )
-    
-    # Add average effectiveness metric
-    avg_effectiveness = sum(
-        c["avg_effectiveness"] for c in results["campaigns"]
-    ) / len(results["campaigns"])
-    
-    metrics.append(
+            value=num_campaigns,
+            last_updated=now
+        ),
         DashboardMetric(
             id="avg_effectiveness",
             name="Average Effectiveness",
             description="Mean effectiveness score",
             type=MetricType.AVERAGE,
             value=avg_effectiveness,
-            last_updated=datetime.utcnow()
+            last_updated=now
         )
-    )
-    
-    return metrics
+    ]
 
 def _generate_narrative(
     intent: Dict[str, Any],
@@ -188,9 +199,13 @@ def _generate_narrative(
 ) -> str:
     """Generate natural language narrative from results."""
     # TODO: Implement GPT-based narrative generation
-    return f"""
-    Found {metrics[0].value} campaigns matching your criteria.
-    The average effectiveness score is {metrics[1].value:.2f}.
-    Top performing campaign: {results['campaigns'][0]['campaign_name']}
-    with {results['campaigns'][0]['num_assets']} assets.
-    """ 
\ No newline at end of file
+    campaigns = results["campaigns"]
+    if not campaigns:
+        return NO_RESULTS_NARRATIVE
+    top = campaigns[0]
+    return NARRATIVE_TEMPLATE.format(
+        count=metrics[0].value,
+        avg_effectiveness=metrics[1].value,
+        top_name=top["campaign_name"],
+        top_assets=top["num_assets"]
+    )
@@ -1,6 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy.orm import Session, noload
+from sqlalchemy import func, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional
 import uuid
 
@@ -14,11 +15,21 @@ from ..schemas import (
 
 router = APIRouter(prefix="/tags", tags=["tags"])
 
+# TagRead and these routes use no relationships; skip the models' default
+# selectin loading so a tag lookup doesn't walk its campaigns and assets
+NO_RELATIONS = [noload("*")]
+
+def _get_tag_by_name(db: Session, name: str) -> Optional[Tag]:
+    """Look up a tag by name via the (tenant_id, name) unique index."""
+    return db.execute(
+        select(Tag).where(Tag.name == name).options(*NO_RELATIONS).limit(1)
+    ).scalar_one_or_none()
+
 @router.post("/", response_model=TagRead)
 def create_tag(payload: TagCreate, db: Session = Depends(get_db)):
     """Create a new tag."""
     # Check for existing tag with same name
-    existing = db.query(Tag).filter_by(name=payload.name).first()
+    existing = _get_tag_by_name(db, payload.name)
     if existing:
         raise HTTPException(400, detail="Tag already exists")
     
@@ -36,18 +47,27 @@ def create_tag(payload: TagCreate, db: Session = Depends(get_db)):
 @router.get("/", response_model=List[TagRead])
 def list_tags(
     search: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db)
 ):
-    """List all tags, optionally filtered by search term."""
-    query = db.query(Tag)
+    """List tags by name, optionally filtered by search term.
+
+    Pages are keyset-paginated: pass the last name of the previous page as
+    ``after`` to fetch the next one.
+    """
+    stmt = select(Tag).options(*NO_RELATIONS)
     if search:
-        query = query.filter(Tag.name.ilike(f"%{search}%"))
-    return query.order_by(Tag.name).all()
+        # Served by the pg_trgm GIN index on tags.name
+        stmt = stmt.where(Tag.name.ilike(f"%{search}%"))
+    if after is not None:
+        stmt = stmt.where(Tag.name > after)
+    return db.execute(stmt.order_by(Tag.name).limit(limit)).scalars().all()
 
 @router.get("/{tag_id}", response_model=TagRead)
 def get_tag(tag_id: str, db: Session = Depends(get_db)):
     """Get a specific tag by ID."""
-    tag = db.query(Tag).get(tag_id)
+    tag = db.get(Tag, tag_id, options=NO_RELATIONS)
     if not tag:
         raise HTTPException(404, detail="Tag not found")
     return tag
@@ -55,13 +75,13 @@ def get_tag(tag_id: str, db: Session = Depends(get_db)):
 @router.patch("/{tag_id}", response_model=TagRead)
 def update_tag(tag_id: str, payload: TagUpdate, db: Session = Depends(get_db)):
     """Update a tag's name or description."""
-    tag = db.query(Tag).get(tag_id)
+    tag = db.get(Tag, tag_id, options=NO_RELATIONS)
     if not tag:
         raise HTTPException(404, detail="Tag not found")
     
     # Check if new name conflicts with existing tag
     if payload.name != tag.name:
-        existing = db.query(Tag).filter_by(name=payload.name).first()
+        existing = _get_tag_by_name(db, payload.name)
         if existing:
             raise HTTPException(400, detail="Tag name already exists")
     
@@ -73,7 +93,7 @@ def update_tag(tag_id: str, payload: TagUpdate, db: Session = Depends(get_db)):
 @router.delete("/{tag_id}", status_code=204)
 def delete_tag(tag_id: str, db: Session = Depends(get_db)):
     """Delete a tag and its associations."""
-    tag = db.query(Tag).get(tag_id)
+    tag = db.get(Tag, tag_id, options=NO_RELATIONS)
     if not tag:
         raise HTTPException(404, detail="Tag not found")
     
@@ -93,22 +113,22 @@ def tag_campaign(
 ):
     """Add tags to a campaign."""
     # Verify campaign exists
-    campaign = db.query(Campaign).get(campaign_id)
+    campaign = db.get(Campaign, campaign_id, options=NO_RELATIONS)
     if not campaign:
         raise HTTPException(404, detail="Campaign not found")
     
     # Verify all tags exist
-    tags = db.query(Tag).filter(Tag.tag_id.in_(payload.tag_ids)).all()
+    tags = db.query(Tag).options(*NO_RELATIONS).filter(Tag.tag_id.in_(payload.tag_ids)).all()
     if len(tags) != len(payload.tag_ids):
         raise HTTPException(400, detail="One or more tags not found")
     
-    # Add associations
-    for tag in tags:
-        assoc = CampaignTag(
-            campaign_id=campaign_id,
-            tag_id=tag.tag_id
+    # Add associations in a single statement; re-tagging is a no-op
+    if tags:
+        db.execute(
+            pg_insert(CampaignTag)
+            .values([{"campaign_id": campaign_id, "tag_id": tag.tag_id} for tag in tags])
+            .on_conflict_do_nothing()
         )
-        db.add(assoc)
     
     db.commit()
     return tags
@@ -121,22 +141,22 @@ def tag_asset(
 ):
     """Add tags to an asset."""
     # Verify asset exists
-    asset = db.query(Asset).get(asset_id)
+    asset = db.get(Asset, asset_id, options=NO_RELATIONS)
     if not asset:
         raise HTTPException(404, detail="Asset not found")
     
     # Verify all tags exist
-    tags = db.query(Tag).filter(Tag.tag_id.in_(payload.tag_ids)).all()
+    tags = db.query(Tag).options(*NO_RELATIONS).filter(Tag.tag_id.in_(payload.tag_ids)).all()
     if len(tags) != len(payload.tag_ids):
         raise HTTPException(400, detail="One or more tags not found")
     
-    # Add associations
-    for tag in tags:
-        assoc = AssetTag(
-            asset_id=asset_id,
-            tag_id=tag.tag_id
+    # Add associations in a single statement; re-tagging is a no-op
+    if tags:
+        db.execute(
+            pg_insert(AssetTag)
+            .values([{"asset_id": asset_id, "tag_id": tag.tag_id} for tag in tags])
+            .on_conflict_do_nothing()
         )
-        db.add(assoc)
     
     db.commit()
     return tags
@@ -144,9 +164,28 @@ def tag_asset(
 @router.get("/stats", response_model=List[TagStats])
 def get_tag_stats(db: Session = Depends(get_db)):
     """Get usage statistics for all tags."""
-    return db.query(
+    # Aggregate each association table on its own before joining; joining both
+    # onto tags first multiplies campaign rows by asset rows per tag.
+    campaign_counts = (
+        db.query(CampaignTag.tag_id, func.count().label('c'))
+        .group_by(CampaignTag.tag_id)
+        .subquery()
+    )
+    asset_counts = (
+        db.query(AssetTag.tag_id, func.count().label('c'))
+        .group_by(AssetTag.tag_id)
+        .subquery()
+    )
+    rows = db.query(
         Tag.tag_id,
         Tag.name,
-        func.count(CampaignTag.campaign_id).label('campaign_count'),
-        func.count(AssetTag.asset_id).label('asset_count')
-    ).outerjoin(CampaignTag).outerjoin(AssetTag).group_by(Tag.tag_id, Tag.name).all() 
\ No newline at end of file
+        func.coalesce(campaign_counts.c.c, 0).label('campaign_count'),
+        func.coalesce(asset_counts.c.c, 0).label('asset_count')
+    ).outerjoin(
+        campaign_counts, campaign_counts.c.tag_id == Tag.tag_id
+    ).outerjoin(
+        asset_counts, asset_counts.c.tag_id == Tag.tag_id
+    ).all()
+    # Columns come straight from our own query with the right types, so
+    # skip per-field validation when building the response models
+    return [TagStats.model_construct(**row._asdict()) for row in rows] 
\ No newline at end of file
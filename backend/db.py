@@ -1,24 +1,79 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
 from sqlalchemy.pool import QueuePool
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# The API routes use async_engine below; this pool only serves tags,
+# ask_ces and the scripts. Both pools together (15 + 60) stay under
+# Postgres's default max_connections of 100.
 engine = create_engine(
     DATABASE_URL,
     poolclass=QueuePool,
     pool_size=5,
     max_overflow=10,
     pool_timeout=30,
+    pool_recycle=300,
     pool_pre_ping=True
 )
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+# Tenant applied to every SessionLocal transaction opened inside tenant()
+tenant_ctx: ContextVar[Optional[str]] = ContextVar("tenant", default=None)
+
+SET_TENANT_SQL = text("SELECT set_config('app.current_tenant', :tenant, true)")
+
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_tenant(session, transaction, connection):
+    # Transaction-local, so the setting is gone at COMMIT/ROLLBACK and
+    # never leaks to the next checkout of a pooled connection.
+    tenant_id = tenant_ctx.get()
+    if tenant_id:
+        connection.execute(SET_TENANT_SQL, {"tenant": tenant_id})
+
+@contextmanager
+def tenant(tenant_id: str) -> Iterator[None]:
+    """Scope RLS policies to a tenant for transactions begun in this block."""
+    token = tenant_ctx.set(tenant_id)
+    try:
+        yield
+    finally:
+        tenant_ctx.reset(token)
+
+# Async engine for the API routes, on the same database via asyncpg
+async_engine = create_async_engine(
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg"),
+    pool_size=20,
+    max_overflow=40,
+    pool_timeout=30,
+    pool_recycle=300,
+    pool_pre_ping=True
+)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+def set_tenant(db: Session, tenant_id: str):
+    """Scope RLS policies to a tenant for the current transaction."""
+    db.execute(SET_TENANT_SQL, {"tenant": tenant_id})
+
+async def set_tenant_async(db: AsyncSession, tenant_id: str):
+    """Scope RLS policies to a tenant for the current transaction."""
+    await db.execute(SET_TENANT_SQL, {"tenant": tenant_id})
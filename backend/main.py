@@ -1,16 +1,26 @@
 from fastapi import FastAPI, Depends, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
 from typing import List, Optional
+import os
+import time
 import uuid
 from datetime import datetime, timedelta
 import jwt
-from functools import wraps
+import orjson
+from functools import lru_cache, wraps
 
-from . import models, db
-from .db import get_db
+from . import models
+from .db import AsyncSessionLocal, async_engine, get_async_db, set_tenant_async
 
-app = FastAPI(title="CES Monitor API")
+# Routes return ORJSONResponse directly: orjson encodes datetimes natively
+# and returning the response skips FastAPI's jsonable_encoder pass
+app = FastAPI(title="CES Monitor API", default_response_class=ORJSONResponse)
+
+HISTORY_BATCH_SIZE = 1000  # Rows fetched and encoded per chunk of metric history
 
 # Configure CORS
 app.add_middleware(
@@ -21,70 +31,119 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("startup")
+async def warm_pool():
+    # Open a connection up front so the first request doesn't pay for the
+    # asyncpg handshake and type introspection
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+JWT_SECRET = os.getenv("JWT_SECRET", "your-secret-key")
+
+# Repeat callers send the same token on every request, so keep verified
+# payloads around instead of re-running the HMAC check each time.
+# Failed decodes raise and are never cached.
+@lru_cache(maxsize=4096)
+def _decode_jwt(token: str) -> dict:
+    return jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+
 # JWT verification
 def verify_jwt(authorization: str = Header(...)):
     try:
         token = authorization.split(" ")[1]
-        payload = jwt.decode(token, "your-secret-key", algorithms=["HS256"])
-        return payload
+        payload = _decode_jwt(token)
     except Exception as e:
         raise HTTPException(status_code=401, detail="Invalid token")
+    # A cached payload skips jwt.decode's own expiry check
+    if "exp" in payload and payload["exp"] <= time.time():
+        raise HTTPException(status_code=401, detail="Invalid token")
+    return payload
 
-# Tenant-aware database session
-def get_tenant_session(token_payload: dict = Depends(verify_jwt)):
+# Tenant-aware database session; FastAPI closes it via get_async_db once
+# the request finishes, returning the connection to the pool
+async def get_tenant_session(
+    token_payload: dict = Depends(verify_jwt),
+    db_session: AsyncSession = Depends(get_async_db)
+):
     tenant = token_payload.get("tenant_id", "scout")  # Default to 'scout' if not specified
-    db_session = next(get_db())
-    db_session.execute(f"SET app.current_tenant = '{tenant}'")
-    return db_session
+    await set_tenant_async(db_session, tenant)
+    yield db_session
 
 @app.get("/api/sensors")
-def get_sensors(db: Session = Depends(get_tenant_session)):
-    sensors = db.query(models.Sensor).all()
-    return [
+async def get_sensors(db: AsyncSession = Depends(get_tenant_session)):
+    # Metrics must be eager-loaded; lazy loads can't run under AsyncSession,
+    # and raiseload turns any other relationship access into an error
+    result = await db.execute(
+        select(models.Sensor).options(
+            selectinload(models.Sensor.metrics), raiseload("*")
+        )
+    )
+    sensors = result.scalars().all()
+    return ORJSONResponse([
         {
             "id": sensor.id,
             "name": sensor.name,
             "status": sensor.status.value,
-            "lastRun": sensor.last_run.isoformat(),
+            "lastRun": sensor.last_run,
             "metrics": [
                 {
                     "accuracy": metric.accuracy,
                     "latency": metric.latency,
                     "throughput": metric.throughput,
-                    "timestamp": metric.timestamp.isoformat()
+                    "timestamp": metric.timestamp
                 }
                 for metric in sensor.metrics
             ] if sensor.metrics else None
         }
         for sensor in sensors
-    ]
+    ])
 
 @app.get("/api/metrics/history")
-def get_metric_history(
+async def get_metric_history(
     hours: int = 24,
-    db: Session = Depends(get_tenant_session)
+    token_payload: dict = Depends(verify_jwt)
 ):
+    tenant = token_payload.get("tenant_id", "scout")
     cutoff = datetime.utcnow() - timedelta(hours=hours)
-    metrics = (
-        db.query(models.SensorMetrics)
-        .filter(models.SensorMetrics.timestamp >= cutoff)
+    stmt = (
+        select(
+            models.SensorMetrics.timestamp,
+            models.SensorMetrics.accuracy,
+            models.SensorMetrics.latency,
+            models.SensorMetrics.throughput
+        )
+        .where(models.SensorMetrics.timestamp >= cutoff)
         .order_by(models.SensorMetrics.timestamp)
-        .all()
+        .execution_options(yield_per=HISTORY_BATCH_SIZE)
     )
-    
-    return [
-        {
-            "timestamp": metric.timestamp.isoformat(),
-            "accuracy": metric.accuracy,
-            "latency": metric.latency,
-            "throughput": metric.throughput
-        }
-        for metric in metrics
-    ]
+
+    async def stream_rows():
+        # The session is owned by the generator rather than a dependency,
+        # since dependencies may be torn down before the body is streamed
+        async with AsyncSessionLocal() as session:
+            await set_tenant_async(session, tenant)
+            result = await session.stream(stmt)
+            yield b"["
+            first = True
+            async for rows in result.partitions():
+                chunk = orjson.dumps([
+                    {
+                        "timestamp": timestamp,
+                        "accuracy": accuracy,
+                        "latency": latency,
+                        "throughput": throughput
+                    }
+                    for timestamp, accuracy, latency, throughput in rows
+                ])[1:-1]
+                yield chunk if first else b"," + chunk
+                first = False
+            yield b"]"
+
+    return StreamingResponse(stream_rows(), media_type="application/json")
 
 @app.post("/api/retrain")
-def trigger_retrain(db: Session = Depends(get_tenant_session)):
-    tenant = db.execute("SELECT current_setting('app.current_tenant')").scalar()
+async def trigger_retrain(db: AsyncSession = Depends(get_tenant_session)):
+    tenant = (await db.execute(text("SELECT current_setting('app.current_tenant')"))).scalar()
     job = models.RetrainingJob(
         id=str(uuid.uuid4()),
         tenant_id=tenant,
@@ -92,38 +151,44 @@ def trigger_retrain(db: Session = Depends(get_tenant_session)):
         started_at=datetime.utcnow()
     )
     db.add(job)
-    db.commit()
+    await db.commit()
     
     # Here you would trigger your actual retraining process
     # For now, we'll just return the job ID
     return {"jobId": job.id}
 
 @app.get("/api/model/status")
-def get_model_status(db: Session = Depends(get_tenant_session)):
-    status = db.query(models.ModelStatus).order_by(models.ModelStatus.updated_at.desc()).first()
+async def get_model_status(db: AsyncSession = Depends(get_tenant_session)):
+    result = await db.execute(
+        select(models.ModelStatus).order_by(models.ModelStatus.updated_at.desc()).limit(1)
+    )
+    status = result.scalars().first()
     if not status:
         raise HTTPException(status_code=404, detail="No model status found")
     
-    return {
+    return ORJSONResponse({
         "status": status.status,
-        "lastTrained": status.last_trained.isoformat(),
+        "lastTrained": status.last_trained,
         "metrics": {
             "accuracy": status.accuracy,
             "latency": status.latency,
             "throughput": status.throughput
         }
-    }
+    })
 
 @app.get("/api/retraining/jobs")
-def get_retraining_jobs(db: Session = Depends(get_tenant_session)):
-    jobs = db.query(models.RetrainingJob).order_by(models.RetrainingJob.created_at.desc()).all()
-    return [
+async def get_retraining_jobs(db: AsyncSession = Depends(get_tenant_session)):
+    result = await db.execute(
+        select(models.RetrainingJob).order_by(models.RetrainingJob.created_at.desc())
+    )
+    jobs = result.scalars().all()
+    return ORJSONResponse([
         {
             "id": job.id,
             "status": job.status.value,
-            "startedAt": job.started_at.isoformat(),
-            "completedAt": job.completed_at.isoformat() if job.completed_at else None,
+            "startedAt": job.started_at,
+            "completedAt": job.completed_at,
             "errorMessage": job.error_message
         }
         for job in jobs
-    ] 
\ No newline at end of file
+    ]) 
\ No newline at end of file
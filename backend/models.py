@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, String, Integer, DateTime, ForeignKey, Float, Enum, func, Table, Text
+    Column, String, Integer, DateTime, ForeignKey, Float, Enum, func, Table, Text, Index
 )
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
@@ -8,19 +8,20 @@ from datetime import datetime
 
 Base = declarative_base()
 
-# Association tables for many-to-many relationships
+# Association tables for many-to-many relationships; both sides are indexed
+# so selectin loads from either direction can use an index for their IN lists
 campaign_tags = Table(
     'campaign_tags',
     Base.metadata,
-    Column('campaign_id', Integer, ForeignKey('campaigns.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('campaign_id', Integer, ForeignKey('campaigns.id'), index=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), index=True)
 )
 
 asset_tags = Table(
     'asset_tags',
     Base.metadata,
-    Column('asset_id', Integer, ForeignKey('assets.id')),
-    Column('tag_id', Integer, ForeignKey('tags.id'))
+    Column('asset_id', Integer, ForeignKey('assets.id'), index=True),
+    Column('tag_id', Integer, ForeignKey('tags.id'), index=True)
 )
 
 class SensorStatus(enum.Enum):
@@ -44,13 +45,13 @@ class Sensor(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
-    metrics = relationship("SensorMetrics", back_populates="sensor")
+    metrics = relationship("SensorMetrics", back_populates="sensor", lazy="selectin")
 
 class SensorMetrics(Base):
     __tablename__ = "sensor_metrics"
 
     id = Column(String, primary_key=True)
-    tenant_id = Column(String, nullable=False, index=True)
+    tenant_id = Column(String, nullable=False)
     sensor_id = Column(String, ForeignKey("sensors.id"), nullable=False)
     accuracy = Column(Float, nullable=False)
     latency = Column(Float, nullable=False)
@@ -58,13 +59,18 @@ class SensorMetrics(Base):
     timestamp = Column(DateTime(timezone=True), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    sensor = relationship("Sensor", back_populates="metrics")
+    sensor = relationship("Sensor", back_populates="metrics", lazy="selectin")
+
+    __table_args__ = (
+        Index("ix_sensor_metrics_tenant_sensor_ts", "tenant_id", "sensor_id", timestamp.desc()),
+        Index("ix_sensor_metrics_tenant_ts", "tenant_id", timestamp.desc()),
+    )
 
 class ModelStatus(Base):
     __tablename__ = "model_status"
 
     id = Column(String, primary_key=True)
-    tenant_id = Column(String, nullable=False, index=True)
+    tenant_id = Column(String, nullable=False)
     status = Column(String, nullable=False)
     last_trained = Column(DateTime(timezone=True), nullable=False)
     accuracy = Column(Float, nullable=False)
@@ -73,11 +79,15 @@ class ModelStatus(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_model_status_tenant_updated", "tenant_id", updated_at.desc()),
+    )
+
 class RetrainingJob(Base):
     __tablename__ = "retraining_jobs"
 
     id = Column(String, primary_key=True)
-    tenant_id = Column(String, nullable=False, index=True)
+    tenant_id = Column(String, nullable=False)
     status = Column(Enum(RetrainingStatus), nullable=False)
     started_at = Column(DateTime(timezone=True), nullable=False)
     completed_at = Column(DateTime(timezone=True))
@@ -85,6 +95,14 @@ class RetrainingJob(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_retraining_jobs_tenant_created", "tenant_id", created_at.desc()),
+        Index(
+            "ix_retraining_jobs_tenant_status_active", "tenant_id", "status",
+            postgresql_where=status.in_([RetrainingStatus.PENDING, RetrainingStatus.RUNNING])
+        ),
+    )
+
 class Tag(Base):
     __tablename__ = 'tags'
     
@@ -94,8 +112,8 @@ class Tag(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    campaigns = relationship('Campaign', secondary=campaign_tags, back_populates='tags')
-    assets = relationship('Asset', secondary=asset_tags, back_populates='tags')
+    campaigns = relationship('Campaign', secondary=campaign_tags, back_populates='tags', lazy='selectin')
+    assets = relationship('Asset', secondary=asset_tags, back_populates='tags', lazy='selectin')
 
 class Campaign(Base):
     __tablename__ = 'campaigns'
@@ -109,8 +127,8 @@ class Campaign(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    tags = relationship('Tag', secondary=campaign_tags, back_populates='campaigns')
-    assets = relationship('Asset', back_populates='campaign')
+    tags = relationship('Tag', secondary=campaign_tags, back_populates='campaigns', lazy='selectin')
+    assets = relationship('Asset', back_populates='campaign', lazy='selectin')
 
 class Asset(Base):
     __tablename__ = 'assets'
@@ -125,5 +143,5 @@ class Asset(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
-    campaign = relationship('Campaign', back_populates='assets')
-    tags = relationship('Tag', secondary=asset_tags, back_populates='assets') 
\ No newline at end of file
+    campaign = relationship('Campaign', back_populates='assets', lazy='selectin')
+    tags = relationship('Tag', secondary=asset_tags, back_populates='assets', lazy='selectin') 
\ No newline at end of file
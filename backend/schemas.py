@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import List, Optional
 from datetime import datetime
 import uuid
@@ -13,14 +13,16 @@ class TagCreate(TagBase):
 class TagUpdate(TagBase):
     pass
 
+# Config shared by response models built from ORM objects and query rows
+READ_MODEL_CONFIG = ConfigDict(from_attributes=True, ser_json_timedelta='iso8601')
+
 class TagRead(TagBase):
+    model_config = READ_MODEL_CONFIG
+
     tag_id: str
     created_at: datetime
     tenant_id: str
 
-    class Config:
-        orm_mode = True
-
 class CampaignTagCreate(BaseModel):
     campaign_id: str
     tag_ids: List[str]
@@ -30,11 +32,15 @@ class AssetTagCreate(BaseModel):
     tag_ids: List[str]
 
 class TaggedItem(BaseModel):
+    model_config = READ_MODEL_CONFIG
+
     id: str
     name: str
     tags: List[TagRead]
 
 class TagStats(BaseModel):
+    model_config = READ_MODEL_CONFIG
+
     tag_id: str
     name: str
     campaign_count: int
@@ -1,16 +1,23 @@
 #!/usr/bin/env python3
 from prefect import flow, task, get_run_logger
-from prefect.tasks import task_input_hash
 from datetime import timedelta, datetime
 import os
 import json
-import csv
+import orjson
 from pathlib import Path
 from typing import List, Dict, Optional, Any
 import subprocess
 import uuid
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
 from dataclasses import dataclass
 from enum import Enum
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
 
 # ——— CONFIG ———
 RCLONE_CONFIG = os.getenv("RCLONE_CONFIG", "~/.config/rclone/rclone.conf")
@@ -18,6 +25,13 @@ DRIVE_REMOTE = os.getenv("DRIVE_REMOTE", "tbwa-drive")
 ROOT_FOLDER = os.getenv("DRIVE_CAMPAIGN_ROOT_ID", "0AJMhu01UUQKoUk9PVA")
 OUTPUT_DIR = Path("data")
 CHECKPOINT_FILE = OUTPUT_DIR / ".drive_checkpoint.json"
+PARQUET_FILE = OUTPUT_DIR / "campaign_assets.parquet"
+CSV_FILE = OUTPUT_DIR / "campaign_assets.csv"
+EXPORT_CSV = os.getenv("DRIVE_EXPORT_CSV", "false").lower() == "true"
+PROCESS_CHUNK_SIZE = 2000  # Assets handed to each worker process at a time
+CSV_BATCH_ROWS = 16384  # Rows Arrow encodes per CSV write call
+# Low-cardinality columns worth dictionary-encoding in Parquet
+DICTIONARY_COLUMNS = ["mime_type", "asset_type", "campaign_folder", "extension"]
 
 class AssetType(Enum):
     FOLDER = "folder"
@@ -27,9 +41,20 @@ class AssetType(Enum):
     AUDIO = "audio"
     OTHER = "other"
 
-@dataclass
+_DOC_EXT = frozenset({".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"})
+_MIME_PREFIX_TYPES = {
+    "image": AssetType.IMAGE,
+    "video": AssetType.VIDEO,
+    "audio": AssetType.AUDIO,
+}
+
+@dataclass(slots=True)
 class AssetMetadata:
-    """Structured metadata for campaign assets."""
+    """Structured metadata for campaign assets.
+
+    Slotted: one instance is built per Drive file, so skipping the
+    per-instance __dict__ adds up on large listings.
+    """
     asset_id: str
     file_name: str
     mime_type: str
@@ -50,14 +75,47 @@ class AssetMetadata:
     parent_folder: Optional[str]
     tags: List[str]
 
+def _drive_changes_token() -> Optional[str]:
+    """Current Drive changes page token for the campaign root, if reachable.
+
+    The token advances whenever anything in the shared drive changes, so it
+    works as a version stamp for the listing.
+    """
+    creds_file = os.getenv("DRIVE_SERVICE_ACCOUNT_FILE")
+    if not creds_file:
+        return None
+    try:
+        creds = service_account.Credentials.from_service_account_file(
+            creds_file,
+            scopes=["https://www.googleapis.com/auth/drive.readonly"]
+        )
+        service = build("drive", "v3", credentials=creds, cache_discovery=False)
+        response = service.changes().getStartPageToken(
+            driveId=ROOT_FOLDER,
+            supportsAllDrives=True
+        ).execute()
+        return response["startPageToken"]
+    except Exception:
+        return None
+
+def _drive_cache_key(context, parameters) -> Optional[str]:
+    # No token means we can't tell whether Drive changed, so skip the cache
+    token = parameters.get("changes_token")
+    if token is None:
+        return None
+    return f"drive-listing:{DRIVE_REMOTE}:{ROOT_FOLDER}:{token}"
+
 @task(
     retries=3,
     retry_delay_seconds=60,
-    cache_key_fn=task_input_hash,
-    cache_expiration=timedelta(hours=1)
+    cache_key_fn=_drive_cache_key,
+    cache_expiration=timedelta(days=1)
 )
-def list_drive_assets() -> List[Dict]:
-    """List all assets in Drive folder with retries and caching."""
+def list_drive_assets(changes_token: Optional[str] = None) -> List[Dict]:
+    """List all assets in Drive folder with retries and caching.
+
+    changes_token only keys the cache; the flow fetches it once per run.
+    """
     logger = get_run_logger()
     logger.info("🔍 Listing Drive assets...")
     
@@ -72,16 +130,17 @@ def list_drive_assets() -> List[Dict]:
                 "--include", "*.{pdf,doc,docx,xls,xlsx,ppt,pptx,jpg,jpeg,png,mp4,mov}"
             ],
             check=True,
-            capture_output=True,
-            text=True
+            capture_output=True
         )
-        assets = json.loads(result.stdout)
+        # Parse rclone's raw bytes directly; decoding stdout to str first
+        # would hold a second full copy of the listing in memory
+        assets = orjson.loads(result.stdout)
         logger.info(f"✅ Found {len(assets)} assets")
         return assets
     except subprocess.CalledProcessError as e:
-        logger.error(f"❌ rclone failed: {e.stderr}")
+        logger.error(f"❌ rclone failed: {e.stderr.decode(errors='replace')}")
         raise
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.error("❌ Failed to parse rclone output")
         raise
 
@@ -90,36 +149,35 @@ def _get_asset_type(mime_type: str, extension: str) -> AssetType:
     if mime_type == "application/vnd.google-apps.folder":
         return AssetType.FOLDER
     
-    if mime_type.startswith("image/"):
-        return AssetType.IMAGE
-    if mime_type.startswith("video/"):
-        return AssetType.VIDEO
-    if mime_type.startswith("audio/"):
-        return AssetType.AUDIO
+    asset_type = _MIME_PREFIX_TYPES.get(mime_type.partition("/")[0])
+    if asset_type is not None:
+        return asset_type
     
-    doc_extensions = {".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx"}
-    if extension.lower() in doc_extensions:
+    if extension.lower() in _DOC_EXT:
         return AssetType.DOCUMENT
     
     return AssetType.OTHER
 
-@task
-def process_assets(assets: List[Dict]) -> List[AssetMetadata]:
-    """Process and enrich asset metadata."""
-    logger = get_run_logger()
-    logger.info("🔄 Processing assets...")
-    
+def _process_chunk(assets: List[Dict], listed_at: str) -> List[AssetMetadata]:
+    """Build metadata for a slice of assets (runs in a worker process)."""
+    # One random UUID per chunk; each asset XORs its index into the low
+    # bits, which leaves the version and variant bits intact and keeps
+    # every id in the chunk distinct without a urandom call per asset
+    uuid_base = uuid.uuid4().int
     processed = []
-    for asset in assets:
+    for i, asset in enumerate(assets):
         # Basic metadata
         path = asset.get("Path", "")
         name = asset.get("Name", "")
-        extension = os.path.splitext(name)[1].lower()
+        # Same result as os.path.splitext (leading dots aren't an extension)
+        stem, _, ext = name.rpartition(".")
+        extension = "." + ext.lower() if stem.lstrip(".") else ""
         
-        # Compute folder depth and parent
-        parts = path.split("/")
-        folder_depth = len(parts) - 1
-        parent_folder = parts[-2] if folder_depth > 0 else None
+        # Compute folder depth and parent without splitting the whole path
+        folder_depth = path.count("/")
+        parent_folder = (
+            path.rpartition("/")[0].rpartition("/")[2] if folder_depth > 0 else None
+        )
         
         # Determine asset type
         asset_type = _get_asset_type(
@@ -151,10 +209,10 @@ def process_assets(assets: List[Dict]) -> List[AssetMetadata]:
             last_viewed_time=asset.get("LastViewed"),
             owner=asset.get("Owner"),
             folder_depth=folder_depth,
-            campaign_folder=parts[0] if parts else "",
+            campaign_folder=path.partition("/")[0],
             asset_type=asset_type,
-            listed_at=datetime.utcnow().isoformat(),
-            uuid=str(uuid.uuid4()),
+            listed_at=listed_at,
+            uuid=str(uuid.UUID(int=uuid_base ^ i)),
             clean_path=path.replace("\\", "/").strip("/"),
             extension=extension,
             is_shared=is_shared,
@@ -165,25 +223,60 @@ def process_assets(assets: List[Dict]) -> List[AssetMetadata]:
         
         processed.append(metadata)
     
+    return processed
+
+@task
+def process_assets(assets: List[Dict]) -> List[AssetMetadata]:
+    """Process and enrich asset metadata."""
+    logger = get_run_logger()
+    logger.info("🔄 Processing assets...")
+    
+    # Each asset is transformed independently, so spread chunks across
+    # processes; small listings aren't worth the worker startup cost
+    listed_at = datetime.utcnow().isoformat()
+    if len(assets) <= PROCESS_CHUNK_SIZE:
+        processed = _process_chunk(assets, listed_at)
+    else:
+        chunks = [
+            assets[i:i + PROCESS_CHUNK_SIZE]
+            for i in range(0, len(assets), PROCESS_CHUNK_SIZE)
+        ]
+        with ProcessPoolExecutor() as executor:
+            processed = list(chain.from_iterable(executor.map(_process_chunk, chunks, repeat(listed_at))))
+    
     logger.info(f"✅ Processed {len(processed)} assets")
     return processed
 
 @task
-def write_checkpoint(assets: List[AssetMetadata]):
+def write_checkpoint(assets: List[AssetMetadata], changes_token: Optional[str] = None):
     """Write checkpoint for incremental runs."""
     logger = get_run_logger()
     logger.info("💾 Writing checkpoint...")
     
+    # Gather all summary stats in a single pass over the assets
+    asset_ids = []
+    total_size = 0
+    shared_count = 0
+    max_depth = 0
+    type_counts = Counter()
+    for a in assets:
+        asset_ids.append(a.asset_id)
+        total_size += a.size_bytes
+        shared_count += a.is_shared
+        if a.folder_depth > max_depth:
+            max_depth = a.folder_depth
+        type_counts[a.asset_type] += 1
+    
     checkpoint = {
         "timestamp": datetime.utcnow().isoformat(),
+        "changes_token": changes_token,
         "asset_count": len(assets),
-        "asset_ids": [a.asset_id for a in assets],
+        "asset_ids": asset_ids,
         "metadata": {
-            "total_size_bytes": sum(a.size_bytes for a in assets),
-            "asset_types": {t.value: sum(1 for a in assets if a.asset_type == t) 
-                          for t in AssetType},
-            "shared_count": sum(1 for a in assets if a.is_shared),
-            "max_depth": max(a.folder_depth for a in assets)
+            "total_size_bytes": total_size,
+            "asset_types": {t.value: type_counts[t] for t in AssetType},
+            "shared_count": shared_count,
+            "max_depth": max_depth
         }
     }
     
@@ -194,67 +287,75 @@ def write_checkpoint(assets: List[AssetMetadata]):
     logger.info("✅ Checkpoint written")
 
 @task
-def write_csv(assets: List[AssetMetadata]):
-    """Write assets to CSV for downstream processing."""
+def write_dataset(assets: List[AssetMetadata]) -> int:
+    """Write assets to Parquet (and CSV if enabled) for downstream processing.
+
+    Returns the number of rows written so verification doesn't have to
+    read the file back.
+    """
     logger = get_run_logger()
-    logger.info("📝 Writing CSV...")
+    logger.info("📝 Writing dataset...")
+    
+    # Build one Arrow table column by column and write every sink from it,
+    # instead of going dataclass -> dict -> writerow per asset
+    columns = {
+        "uuid": [a.uuid for a in assets],
+        "asset_id": [a.asset_id for a in assets],
+        "file_name": [a.file_name for a in assets],
+        "mime_type": [a.mime_type for a in assets],
+        "size_bytes": pa.array([a.size_bytes for a in assets], type=pa.int64()),
+        "modified_time": [a.modified_time for a in assets],
+        "created_time": [a.created_time for a in assets],
+        "last_viewed_time": pa.array([a.last_viewed_time for a in assets], type=pa.string()),
+        "owner": pa.array([a.owner for a in assets], type=pa.string()),
+        "folder_depth": pa.array([a.folder_depth for a in assets], type=pa.int32()),
+        "campaign_folder": [a.campaign_folder for a in assets],
+        "asset_type": [a.asset_type.value for a in assets],
+        "listed_at": [a.listed_at for a in assets],
+        "clean_path": [a.clean_path for a in assets],
+        "extension": [a.extension for a in assets],
+        "is_shared": pa.array([a.is_shared for a in assets], type=pa.bool_()),
+        "shared_with": [orjson.dumps(a.shared_with).decode() for a in assets],
+        "parent_folder": pa.array([a.parent_folder for a in assets], type=pa.string()),
+        "tags": [orjson.dumps(a.tags).decode() for a in assets]
+    }
     
-    csv_file = OUTPUT_DIR / "campaign_assets.csv"
-    fieldnames = [
-        "uuid", "asset_id", "file_name", "mime_type", "size_bytes",
-        "modified_time", "created_time", "last_viewed_time", "owner",
-        "folder_depth", "campaign_folder", "asset_type", "listed_at",
-        "clean_path", "extension", "is_shared", "shared_with",
-        "parent_folder", "tags"
-    ]
+    table = pa.Table.from_pydict(columns)
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    pq.write_table(
+        table, str(PARQUET_FILE),
+        compression="zstd",
+        use_dictionary=DICTIONARY_COLUMNS
+    )
+    logger.info(f"✅ Wrote {table.num_rows} rows to {PARQUET_FILE}")
     
-    with open(csv_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        writer.writeheader()
-        for asset in assets:
-            row = {
-                "uuid": asset.uuid,
-                "asset_id": asset.asset_id,
-                "file_name": asset.file_name,
-                "mime_type": asset.mime_type,
-                "size_bytes": asset.size_bytes,
-                "modified_time": asset.modified_time,
-                "created_time": asset.created_time,
-                "last_viewed_time": asset.last_viewed_time,
-                "owner": asset.owner,
-                "folder_depth": asset.folder_depth,
-                "campaign_folder": asset.campaign_folder,
-                "asset_type": asset.asset_type.value,
-                "listed_at": asset.listed_at,
-                "clean_path": asset.clean_path,
-                "extension": asset.extension,
-                "is_shared": asset.is_shared,
-                "shared_with": json.dumps(asset.shared_with),
-                "parent_folder": asset.parent_folder,
-                "tags": json.dumps(asset.tags)
-            }
-            writer.writerow(row)
+    # CSV is only kept for consumers that can't read Parquet yet
+    if EXPORT_CSV:
+        pa_csv.write_csv(
+            table, str(CSV_FILE),
+            write_options=pa_csv.WriteOptions(batch_size=CSV_BATCH_ROWS)
+        )
+        logger.info(f"✅ Wrote {table.num_rows} rows to {CSV_FILE}")
     
-    logger.info(f"✅ Wrote {len(assets)} rows to {csv_file}")
+    return table.num_rows
 
 @task
-def verify_output(assets: List[AssetMetadata]) -> bool:
+def verify_output(assets: List[AssetMetadata], rows_written: int) -> bool:
     """Verify output files and counts."""
     logger = get_run_logger()
     logger.info("🔍 Verifying output...")
     
-    # Check CSV exists and has right count
-    csv_file = OUTPUT_DIR / "campaign_assets.csv"
-    if not csv_file.exists():
-        logger.error("❌ CSV file not found")
+    # Check dataset files exist and have the right count
+    if not PARQUET_FILE.exists():
+        logger.error("❌ Parquet file not found")
         return False
     
-    with open(csv_file, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
+    if EXPORT_CSV and not CSV_FILE.exists():
+        logger.error("❌ CSV file not found")
+        return False
     
-    if len(rows) != len(assets):
-        logger.error(f"❌ CSV row count mismatch: {len(rows)} vs {len(assets)}")
+    if rows_written != len(assets):
+        logger.error(f"❌ Dataset row count mismatch: {rows_written} vs {len(assets)}")
         return False
     
     # Check checkpoint
@@ -284,18 +385,20 @@ def build_campaign_dataset():
     logger = get_run_logger()
     logger.info("🚀 Starting Drive to Database pipeline...")
     
-    # List assets
-    assets = list_drive_assets()
+    # List assets; the token is taken first so any change made while
+    # listing is still picked up on the next run
+    changes_token = _drive_changes_token()
+    assets = list_drive_assets(changes_token)
     
     # Process metadata
     processed = process_assets(assets)
     
     # Write outputs
-    write_checkpoint(processed)
-    write_csv(processed)
+    write_checkpoint(processed, changes_token)
+    rows_written = write_dataset(processed)
     
     # Verify
-    if not verify_output(processed):
+    if not verify_output(processed, rows_written):
         raise Exception("Output verification failed")
     
     logger.info("✨ Pipeline completed successfully")
@@ -4,24 +4,88 @@ Full Dataset Generator for Campaign Insight Accelerator
 Generates comprehensive mock data for CES monitoring and campaign analytics
 """
 
-import json
-import csv
+import argparse
 import random
+import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 import os
 
+import numpy as np
+import orjson
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+def _interned(values):
+    return [sys.intern(v) for v in values]
+
+def bulk_uuids(n):
+    """Return n random (version 4) UUID strings from a single urandom read"""
+    buf = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=buf[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+# Brands and campaign types that get a performance boost in the mock metrics
+BOOSTED_BRANDS = ("Apple", "Nike", "CocaCola")
+DIGITAL_TYPES = ("Digital", "Social Media")
+
+# Sensor value range and status thresholds: (low, high, OK above, WARN above).
+# For lower-is-better sensors the thresholds are upper bounds instead.
+SENSOR_SPECS = {
+    "data_freshness": (0.85, 1.0, 0.9, 0.8),
+    "model_accuracy": (0.75, 0.95, 0.85, 0.8),
+    "api_latency": (50, 500, 200, 350),  # milliseconds
+    "data_quality": (0.8, 1.0, 0.95, 0.9),
+    "throughput": (800, 1200, 1000, 900),  # requests per minute
+}
+LOWER_IS_BETTER_SENSORS = frozenset({"api_latency"})
+SENSOR_STATUSES = np.array(["OK", "WARN", "FAIL"], dtype=object)
+
+METRICS_BATCH_CAMPAIGNS = 50  # Campaigns whose daily metrics are built and written together
+WRITE_WORKERS = 4  # Tables written concurrently
+
+# Narrower Parquet types for the metrics table. Every metric fits float32 and
+# the counts (<= 60M) fit int32. Floats stay float64 in memory so JSON/CSV
+# keep printing the rounded values exactly (float32 3.45 widens to 3.4500000476...).
+METRIC_PARQUET_TYPES = {
+    "date": pa.date32(),
+    **{name: pa.float32() for name in (
+        "roi", "brand_recall", "engagement_rate", "ctr", "conversion_rate",
+        "cost_per_acquisition", "sentiment_score", "video_completion_rate",
+        "share_rate", "save_rate"
+    )},
+    **{name: pa.int32() for name in ("reach", "impressions", "clicks")},
+}
+
+# Parquet is the primary output; JSON stays on by default because the
+# dashboard (src/lib/dataLoader.ts) loads the .json files. CSV is opt-in.
+OUTPUT_FORMATS = ("parquet", "json", "csv")
+# orjson handles numpy scalars natively; default=str covers anything else
+JSON_OPTIONS = orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY
+DEFAULT_FORMATS = ("parquet", "json")
+
 class FullDatasetGenerator:
-    def __init__(self):
+    def __init__(self, formats=DEFAULT_FORMATS):
+        unknown = set(formats) - set(OUTPUT_FORMATS)
+        if unknown:
+            raise ValueError(f"Unknown output formats: {', '.join(sorted(unknown))}")
+        self.formats = set(formats)
         self.output_dir = Path("data")
         self.output_dir.mkdir(exist_ok=True)
+        self.rng = np.random.default_rng()
         
         # Campaign categories and types
-        self.campaign_types = ["Brand Awareness", "Product Launch", "Seasonal", "Digital", "Social Media", "TV Commercial"]
-        self.industries = ["FMCG", "Automotive", "Tech", "Healthcare", "Fashion", "Finance", "Food & Beverage"]
-        self.regions = ["Global", "APAC", "North America", "Europe", "LATAM", "MEA"]
-        self.brands = ["CocaCola", "Nike", "Apple", "Samsung", "Toyota", "Unilever", "P&G", "McDonald's", "Adidas", "BMW"]
+        # Interned so every generated row points at one shared object per value
+        self.campaign_types = _interned(["Brand Awareness", "Product Launch", "Seasonal", "Digital", "Social Media", "TV Commercial"])
+        self.industries = _interned(["FMCG", "Automotive", "Tech", "Healthcare", "Fashion", "Finance", "Food & Beverage"])
+        self.regions = _interned(["Global", "APAC", "North America", "Europe", "LATAM", "MEA"])
+        self.brands = _interned(["CocaCola", "Nike", "Apple", "Samsung", "Toyota", "Unilever", "P&G", "McDonald's", "Adidas", "BMW"])
+        self.campaign_statuses = _interned(["Active", "Completed", "Paused", "Planning"])
+        self.tenants = _interned(["tbwa", "ces", "scout"])
         
         # Performance metrics ranges
         self.metric_ranges = {
@@ -37,144 +101,250 @@ class FullDatasetGenerator:
 
     def generate_campaigns(self, num_campaigns=500):
         """Generate campaign data"""
-        campaigns = []
+        # Draw each column for every campaign in one call, then zip into rows
+        rng = self.rng
+        n = num_campaigns
+        now = np.datetime64(datetime.now(), "us")
+        start_dates = now - rng.integers(30, 1096, size=n).astype("timedelta64[D]")
+        end_dates = start_dates + rng.integers(7, 181, size=n).astype("timedelta64[D]")
+        created_dates = start_dates - rng.integers(1, 31, size=n).astype("timedelta64[D]")
+        start_years = (start_dates.astype("datetime64[Y]").astype(int) + 1970).tolist()
         
-        for i in range(num_campaigns):
-            start_date = datetime.now() - timedelta(days=random.randint(30, 1095))
-            end_date = start_date + timedelta(days=random.randint(7, 180))
-            
-            campaign = {
-                "campaign_id": str(uuid.uuid4()),
-                "name": f"{random.choice(self.brands)} {random.choice(self.campaign_types)} {start_date.year}",
-                "brand": random.choice(self.brands),
-                "industry": random.choice(self.industries),
-                "type": random.choice(self.campaign_types),
-                "region": random.choice(self.regions),
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "budget": random.randint(50000, 5000000),
-                "status": random.choice(["Active", "Completed", "Paused", "Planning"]),
-                "tenant_id": random.choice(["tbwa", "ces", "scout"]),
-                "created_at": (start_date - timedelta(days=random.randint(1, 30))).isoformat()
-            }
-            campaigns.append(campaign)
+        names = [
+            f"{brand} {campaign_type} {year}"
+            for brand, campaign_type, year in zip(
+                self._choose(self.brands, n),
+                self._choose(self.campaign_types, n),
+                start_years
+            )
+        ]
+        columns = zip(
+            bulk_uuids(n),
+            names,
+            self._choose(self.brands, n),
+            self._choose(self.industries, n),
+            self._choose(self.campaign_types, n),
+            self._choose(self.regions, n),
+            np.datetime_as_string(start_dates).tolist(),
+            np.datetime_as_string(end_dates).tolist(),
+            rng.integers(50000, 5000001, size=n).tolist(),
+            self._choose(self.campaign_statuses, n),
+            self._choose(self.tenants, n),
+            np.datetime_as_string(created_dates).tolist()
+        )
         
-        return campaigns
+        return [
+            {
+                "campaign_id": campaign_id,
+                "name": name,
+                "brand": brand,
+                "industry": industry,
+                "type": campaign_type,
+                "region": region,
+                "start_date": start_date,
+                "end_date": end_date,
+                "budget": budget,
+                "status": status,
+                "tenant_id": tenant_id,
+                "created_at": created_at
+            }
+            for (campaign_id, name, brand, industry, campaign_type, region, start_date,
+                 end_date, budget, status, tenant_id, created_at) in columns
+        ]
+
+    def iter_performance_metrics(self, campaigns, batch_size=METRICS_BATCH_CAMPAIGNS):
+        """Yield performance metrics a batch of campaigns at a time"""
+        for i in range(0, len(campaigns), batch_size):
+            yield self.generate_performance_metrics(campaigns[i:i + batch_size])
+
+    def _choose(self, options, size):
+        """Draw size items from options as the option objects themselves
+        (rng.choice on a list of str would copy them into a new array)"""
+        return self.rng.choice(np.array(options, dtype=object), size=size).tolist()
 
     def generate_performance_metrics(self, campaigns):
-        """Generate performance metrics for campaigns"""
-        metrics = []
-        
-        for campaign in campaigns:
-            # Generate daily metrics for campaign duration
-            start = datetime.fromisoformat(campaign["start_date"])
-            end = datetime.fromisoformat(campaign["end_date"])
-            current = start
-            
-            while current <= end:
-                # Add some noise based on campaign type and brand
-                brand_multiplier = 1.2 if campaign["brand"] in ["Apple", "Nike", "CocaCola"] else 1.0
-                type_multiplier = 1.3 if campaign["type"] in ["Digital", "Social Media"] else 1.0
-                
-                metric = {
-                    "metric_id": str(uuid.uuid4()),
-                    "campaign_id": campaign["campaign_id"],
-                    "date": current.isoformat(),
-                    "roi": round(random.uniform(*self.metric_ranges["roi"]) * brand_multiplier, 2),
-                    "brand_recall": round(random.uniform(*self.metric_ranges["brand_recall"]) * brand_multiplier, 1),
-                    "engagement_rate": round(random.uniform(*self.metric_ranges["engagement_rate"]) * type_multiplier, 2),
-                    "reach": int(random.uniform(*self.metric_ranges["reach"]) * brand_multiplier),
-                    "impressions": int(random.uniform(50000, 10000000) * brand_multiplier),
-                    "clicks": int(random.uniform(500, 500000) * type_multiplier),
-                    "ctr": round(random.uniform(*self.metric_ranges["ctr"]) * type_multiplier, 2),
-                    "conversion_rate": round(random.uniform(*self.metric_ranges["conversion_rate"]), 2),
-                    "cost_per_acquisition": round(random.uniform(*self.metric_ranges["cost_per_acquisition"]), 2),
-                    "sentiment_score": round(random.uniform(*self.metric_ranges["sentiment_score"]), 3),
-                    "video_completion_rate": round(random.uniform(25, 95), 1),
-                    "share_rate": round(random.uniform(0.1, 5.0), 2),
-                    "save_rate": round(random.uniform(0.5, 8.0), 2),
-                    "tenant_id": campaign["tenant_id"]
-                }
-                metrics.append(metric)
-                current += timedelta(days=1)
+        """Generate daily performance metrics for campaigns as a DataFrame"""
+        # One row per campaign day. Every column is drawn for all rows in a
+        # single vectorized call rather than per row in a Python loop.
+        # NumPy parses the ISO strings itself; metrics are daily, so the
+        # campaign bounds are kept as calendar days (datetime64[D])
+        starts = np.array([c["start_date"] for c in campaigns], dtype="datetime64[us]").astype("datetime64[D]")
+        ends = np.array([c["end_date"] for c in campaigns], dtype="datetime64[us]").astype("datetime64[D]")
+        durations = (ends - starts).astype(np.int64) + 1
+        n = int(durations.sum())
+        
+        # Day index of each row within its own campaign (0, 1, ..., duration - 1)
+        day_offsets = np.arange(n) - np.repeat(np.cumsum(durations) - durations, durations)
+        dates = np.repeat(starts, durations) + day_offsets.astype("timedelta64[D]")
+        
+        # Campaign and tenant ids repeat on every row, so keep them as small
+        # integer codes; pandas Categoricals become Arrow dictionary columns
+        # and only turn back into strings for CSV/JSON output
+        campaign_codes = np.repeat(np.arange(len(campaigns)), durations)
+        tenant_codes = np.array([self.tenants.index(c["tenant_id"]) for c in campaigns], dtype=np.int8)
+        
+        # Add some noise based on campaign type and brand
+        brand_multiplier = np.repeat(
+            np.where(np.isin([c["brand"] for c in campaigns], BOOSTED_BRANDS), 1.2, 1.0), durations
+        )
+        type_multiplier = np.repeat(
+            np.where(np.isin([c["type"] for c in campaigns], DIGITAL_TYPES), 1.3, 1.0), durations
+        )
         
-        return metrics
+        rng = self.rng
+        ranges = self.metric_ranges
+        return pd.DataFrame({
+            "metric_id": bulk_uuids(n),
+            "campaign_id": pd.Categorical.from_codes(campaign_codes, [c["campaign_id"] for c in campaigns]),
+            "date": np.datetime_as_string(dates),
+            "roi": np.round(rng.uniform(*ranges["roi"], n) * brand_multiplier, 2),
+            "brand_recall": np.round(rng.uniform(*ranges["brand_recall"], n) * brand_multiplier, 1),
+            "engagement_rate": np.round(rng.uniform(*ranges["engagement_rate"], n) * type_multiplier, 2),
+            "reach": (rng.uniform(*ranges["reach"], n) * brand_multiplier).astype(np.int32),
+            "impressions": (rng.uniform(50000, 10000000, n) * brand_multiplier).astype(np.int32),
+            "clicks": (rng.uniform(500, 500000, n) * type_multiplier).astype(np.int32),
+            "ctr": np.round(rng.uniform(*ranges["ctr"], n) * type_multiplier, 2),
+            "conversion_rate": np.round(rng.uniform(*ranges["conversion_rate"], n), 2),
+            "cost_per_acquisition": np.round(rng.uniform(*ranges["cost_per_acquisition"], n), 2),
+            "sentiment_score": np.round(rng.uniform(*ranges["sentiment_score"], n), 3),
+            "video_completion_rate": np.round(rng.uniform(25, 95, n), 1),
+            "share_rate": np.round(rng.uniform(0.1, 5.0, n), 2),
+            "save_rate": np.round(rng.uniform(0.5, 8.0, n), 2),
+            "tenant_id": pd.Categorical.from_codes(
+                np.repeat(tenant_codes, durations), self.tenants
+            )
+        })
 
     def generate_creative_assets(self, campaigns):
         """Generate creative assets data"""
-        assets = []
-        asset_types = ["video", "image", "banner", "social_post", "infographic", "gif", "story"]
+        asset_types = _interned(["video", "image", "banner", "social_post", "infographic", "gif", "story"])
+        rng = self.rng
         
-        for campaign in campaigns:
-            # Generate 3-15 assets per campaign
-            num_assets = random.randint(3, 15)
-            
-            for i in range(num_assets):
-                asset = {
-                    "asset_id": str(uuid.uuid4()),
-                    "campaign_id": campaign["campaign_id"],
-                    "name": f"{campaign['name']}_asset_{i+1}",
-                    "type": random.choice(asset_types),
-                    "format": random.choice(["jpg", "png", "mp4", "gif", "svg"]),
-                    "size_mb": round(random.uniform(0.1, 50.0), 2),
-                    "dimensions": f"{random.choice([1080, 1920, 728, 300])}x{random.choice([1080, 1920, 90, 250])}",
-                    "duration_seconds": random.randint(5, 60) if asset_types[assets.__len__() % len(asset_types)] == "video" else None,
-                    "emotional_trigger": random.choice(["Joy", "Trust", "Excitement", "Nostalgia", "Surprise", "Fear"]),
-                    "brand_integration": random.choice(["Subtle", "Moderate", "Prominent", "Minimal"]),
-                    "visual_distinctness": round(random.uniform(0.1, 1.0), 2),
-                    "text_readability": round(random.uniform(0.3, 1.0), 2),
-                    "color_harmony": round(random.uniform(0.4, 1.0), 2),
-                    "performance_score": round(random.uniform(0.2, 0.95), 3),
-                    "a_b_test_variant": random.choice(["A", "B", "C", "Control"]) if random.random() > 0.7 else None,
-                    "tenant_id": campaign["tenant_id"],
-                    "created_at": datetime.now().isoformat()
-                }
-                assets.append(asset)
+        # Generate 3-15 assets per campaign, drawing each column for every
+        # asset in one call
+        counts = rng.integers(3, 16, size=len(campaigns))
+        total = int(counts.sum())
+        asset_numbers = (np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts) + 1).tolist()
+        # Look up each campaign's fields once, not once per asset
+        asset_campaigns = [
+            fields
+            for fields, count in zip(
+                [(c["campaign_id"], c["name"], c["tenant_id"]) for c in campaigns],
+                counts.tolist()
+            )
+            for _ in range(count)
+        ]
+        
+        types = self._choose(asset_types, total)
+        # Only videos have a duration, decided by each asset's own type
+        durations = [
+            duration if asset_type == "video" else None
+            for asset_type, duration in zip(types, rng.integers(5, 61, size=total).tolist())
+        ]
+        variants = [
+            variant if tested else None
+            for variant, tested in zip(
+                self._choose(["A", "B", "C", "Control"], total),
+                (rng.random(total) > 0.7).tolist()
+            )
+        ]
+        columns = zip(
+            bulk_uuids(total),
+            asset_campaigns,
+            asset_numbers,
+            types,
+            self._choose(["jpg", "png", "mp4", "gif", "svg"], total),
+            np.round(rng.uniform(0.1, 50.0, total), 2).tolist(),
+            rng.choice([1080, 1920, 728, 300], size=total).tolist(),
+            rng.choice([1080, 1920, 90, 250], size=total).tolist(),
+            durations,
+            self._choose(["Joy", "Trust", "Excitement", "Nostalgia", "Surprise", "Fear"], total),
+            self._choose(["Subtle", "Moderate", "Prominent", "Minimal"], total),
+            np.round(rng.uniform(0.1, 1.0, total), 2).tolist(),
+            np.round(rng.uniform(0.3, 1.0, total), 2).tolist(),
+            np.round(rng.uniform(0.4, 1.0, total), 2).tolist(),
+            np.round(rng.uniform(0.2, 0.95, total), 3).tolist(),
+            variants
+        )
+        created_at = datetime.now().isoformat()
         
-        return assets
+        return [
+            {
+                "asset_id": asset_id,
+                "campaign_id": campaign_id,
+                "name": f"{campaign_name}_asset_{number}",
+                "type": asset_type,
+                "format": asset_format,
+                "size_mb": size_mb,
+                "dimensions": f"{width}x{height}",
+                "duration_seconds": duration,
+                "emotional_trigger": trigger,
+                "brand_integration": integration,
+                "visual_distinctness": distinctness,
+                "text_readability": readability,
+                "color_harmony": harmony,
+                "performance_score": score,
+                "a_b_test_variant": variant,
+                "tenant_id": tenant_id,
+                "created_at": created_at
+            }
+            for (asset_id, (campaign_id, campaign_name, tenant_id), number, asset_type, asset_format, size_mb, width, height,
+                 duration, trigger, integration, distinctness, readability, harmony,
+                 score, variant) in columns
+        ]
 
     def generate_sensors_data(self):
         """Generate sensor monitoring data for pipeline health"""
         sensors = []
-        sensor_types = ["data_freshness", "model_accuracy", "api_latency", "data_quality", "throughput"]
+        sensor_types = list(SENSOR_SPECS)
+        hours = range(0, 24, 4)  # Every 4 hours
+        num_days = 30
         
         # Generate sensor data for last 30 days
-        start_date = datetime.now() - timedelta(days=30)
+        start_date = datetime.now() - timedelta(days=num_days)
+        
+        # Draw every reading at once as a (day, sensor type, hour) grid, with
+        # each type's range and thresholds broadcast along the type axis
+        specs = np.array([SENSOR_SPECS[t] for t in sensor_types], dtype=float)[None, :, :, None]
+        low, high, ok_threshold, warn_threshold = (specs[:, :, i] for i in range(4))
+        values = self.rng.uniform(low, high, size=(num_days, len(sensor_types), len(hours)))
+        
+        # Flip the sign for lower-is-better sensors so one ">" covers every type
+        sign = np.array([-1.0 if t in LOWER_IS_BETTER_SENSORS else 1.0 for t in sensor_types])[None, :, None]
+        status_codes = np.where(
+            sign * values > sign * ok_threshold, 0,
+            np.where(sign * values > sign * warn_threshold, 1, 2)
+        )
+        statuses = SENSOR_STATUSES[status_codes].tolist()
+        values = values.round(3).tolist()
+        sensor_ids = iter(bulk_uuids(num_days * len(sensor_types) * len(hours)))
         
-        for day in range(30):
-            current_date = start_date + timedelta(days=day)
+        # Reading times depend only on (day, hour) and pipeline names only on
+        # the type, so build each once rather than per reading
+        timestamps = [
+            [
+                (start_date + timedelta(days=day)).replace(hour=hour, minute=0, second=0).isoformat()
+                for hour in hours
+            ]
+            for day in range(num_days)
+        ]
+        pipelines = [f"ces_{sensor_type}_pipeline" for sensor_type in sensor_types]
+        
+        for day in range(num_days):
+            day_timestamps = timestamps[day]
             
-            for sensor_type in sensor_types:
-                # Generate multiple readings per day
-                for hour in range(0, 24, 4):  # Every 4 hours
-                    sensor_time = current_date.replace(hour=hour, minute=0, second=0)
-                    
-                    # Sensor-specific value generation
-                    if sensor_type == "data_freshness":
-                        value = random.uniform(0.85, 1.0)
-                        status = "OK" if value > 0.9 else "WARN" if value > 0.8 else "FAIL"
-                    elif sensor_type == "model_accuracy":
-                        value = random.uniform(0.75, 0.95)
-                        status = "OK" if value > 0.85 else "WARN" if value > 0.8 else "FAIL"
-                    elif sensor_type == "api_latency":
-                        value = random.uniform(50, 500)  # milliseconds
-                        status = "OK" if value < 200 else "WARN" if value < 350 else "FAIL"
-                    elif sensor_type == "data_quality":
-                        value = random.uniform(0.8, 1.0)
-                        status = "OK" if value > 0.95 else "WARN" if value > 0.9 else "FAIL"
-                    else:  # throughput
-                        value = random.uniform(800, 1200)  # requests per minute
-                        status = "OK" if value > 1000 else "WARN" if value > 900 else "FAIL"
-                    
+            for t, sensor_type in enumerate(sensor_types):
+                pipeline = pipelines[t]
+                for h in range(len(hours)):
                     sensor = {
-                        "sensor_id": str(uuid.uuid4()),
+                        "sensor_id": next(sensor_ids),
                         "sensor_type": sensor_type,
-                        "timestamp": sensor_time.isoformat(),
-                        "value": round(value, 3),
-                        "status": status,
-                        "tenant_id": random.choice(["tbwa", "ces", "scout"]),
+                        "timestamp": day_timestamps[h],
+                        "value": values[day][t][h],
+                        "status": statuses[day][t][h],
+                        "tenant_id": random.choice(self.tenants),
                         "metadata": {
-                            "pipeline": f"ces_{sensor_type}_pipeline",
+                            "pipeline": pipeline,
                             "environment": "production",
                             "region": random.choice(["us-east-1", "eu-west-1", "ap-southeast-1"])
                         }
@@ -188,17 +358,21 @@ class FullDatasetGenerator:
         models = []
         model_types = ["engagement_predictor", "roi_optimizer", "sentiment_analyzer", "creative_scorer", "audience_segmenter"]
         
+        model_ids = iter(bulk_uuids(len(model_types) * 30))
+        
+        # Same 30 dates for every model type
+        now = datetime.now()
+        dates = [now - timedelta(days=day) for day in range(30)]
+        base_accuracy = 0.85
+        
         for model_type in model_types:
             # Generate model performance over time
-            for day in range(30):
-                date = (datetime.now() - timedelta(days=day))
-                
+            for date in dates:
                 # Simulate model drift and retraining
-                base_accuracy = 0.85
                 drift = random.uniform(-0.05, 0.02)  # Gradual drift down, occasional improvement
                 
                 model = {
-                    "model_id": str(uuid.uuid4()),
+                    "model_id": next(model_ids),
                     "model_type": model_type,
                     "version": f"v{random.randint(1, 5)}.{random.randint(0, 9)}.{random.randint(0, 9)}",
                     "date": date.isoformat(),
@@ -213,7 +387,7 @@ class FullDatasetGenerator:
                     "feature_count": random.randint(15, 150),
                     "last_retrained": (date - timedelta(days=random.randint(1, 14))).isoformat(),
                     "status": random.choice(["active", "deprecated", "testing", "training"]),
-                    "tenant_id": random.choice(["tbwa", "ces", "scout"])
+                    "tenant_id": random.choice(self.tenants)
                 }
                 models.append(model)
         
@@ -222,57 +396,198 @@ class FullDatasetGenerator:
     def save_to_json(self, data, filename):
         """Save data to JSON file"""
         filepath = self.output_dir / f"{filename}.json"
-        with open(filepath, 'w') as f:
-            json.dump(data, f, indent=2, default=str)
+        records = data.to_dict(orient="records") if isinstance(data, pd.DataFrame) else data
+        filepath.write_bytes(orjson.dumps(records, default=str, option=JSON_OPTIONS))
         print(f"✅ Generated {len(data)} records in {filepath}")
 
     def save_to_csv(self, data, filename):
         """Save data to CSV file"""
-        if not data:
+        if len(data) == 0:
             return
             
         filepath = self.output_dir / f"{filename}.csv"
-        with open(filepath, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+        pa_csv.write_csv(self._flatten_for_csv(self._to_arrow(data)), str(filepath))
+        print(f"✅ Generated {len(data)} records in {filepath}")
+
+    def save_to_parquet(self, data, filename):
+        """Save data to a zstd-compressed Parquet file"""
+        if len(data) == 0:
+            return
+        
+        table = self._to_arrow(data)
+        table = self._dictionary_encode(table, self._dictionary_columns(table))
+        
+        filepath = self.output_dir / f"{filename}.parquet"
+        pq.write_table(table, str(filepath), compression="zstd", use_dictionary=True)
         print(f"✅ Generated {len(data)} records in {filepath}")
 
-    def generate_full_dataset(self):
+    def save(self, data, filename):
+        """Save data in every output format this generator was asked for"""
+        if "parquet" in self.formats:
+            self.save_to_parquet(data, filename)
+        if "json" in self.formats:
+            self.save_to_json(data, filename)
+        if "csv" in self.formats:
+            self.save_to_csv(data, filename)
+
+    def save_stream(self, chunks, filename, parquet_types=None):
+        """Save an iterable of DataFrame chunks in every selected format,
+        holding only one chunk in memory at a time. Returns the row count.
+        parquet_types maps column names to narrower Parquet column types."""
+        paths = {fmt: self.output_dir / f"{filename}.{fmt}" for fmt in self.formats}
+        parquet_writer = csv_writer = json_file = None
+        dictionary_columns = None
+        total = 0
+        
+        try:
+            for chunk in chunks:
+                if len(chunk) == 0:
+                    continue
+                total += len(chunk)
+                table = self._to_arrow(chunk)
+                
+                if "parquet" in self.formats:
+                    # Decide dictionary columns once so every chunk shares a schema
+                    if dictionary_columns is None:
+                        dictionary_columns = self._dictionary_columns(table)
+                    encoded = self._dictionary_encode(table, dictionary_columns)
+                    if parquet_types:
+                        encoded = self._cast_columns(encoded, parquet_types)
+                    if parquet_writer is None:
+                        parquet_writer = pq.ParquetWriter(
+                            str(paths["parquet"]), encoded.schema,
+                            compression="zstd", use_dictionary=True
+                        )
+                    parquet_writer.write_table(encoded)
+                
+                if "csv" in self.formats:
+                    flat = self._flatten_for_csv(table)
+                    if csv_writer is None:
+                        csv_writer = pa_csv.CSVWriter(str(paths["csv"]), flat.schema)
+                    csv_writer.write_table(flat)
+                
+                if "json" in self.formats:
+                    # Still one JSON array (the dashboard fetches it whole),
+                    # written out a chunk's worth of elements at a time
+                    if json_file is None:
+                        json_file = open(paths["json"], "wb")
+                        json_file.write(b"[")
+                    else:
+                        json_file.write(b",")
+                    records = chunk.to_dict(orient="records")
+                    json_file.write(orjson.dumps(records, default=str, option=JSON_OPTIONS)[1:-1])
+        finally:
+            if parquet_writer is not None:
+                parquet_writer.close()
+            if csv_writer is not None:
+                csv_writer.close()
+            if json_file is not None:
+                json_file.write(b"]")
+                json_file.close()
+        
+        if total:
+            for fmt in sorted(self.formats):
+                print(f"✅ Generated {total} records in {paths[fmt]}")
+        return total
+
+    @staticmethod
+    def _dictionary_columns(table):
+        """Names of string columns repetitive enough to store as dictionaries
+        (brand, region, tenant, campaign_id on metrics, ...)"""
+        return [
+            field.name for field in table.schema
+            if pa.types.is_string(field.type)
+            and pc.count_distinct(table.column(field.name)).as_py() * 2 <= table.num_rows
+        ]
+
+    @staticmethod
+    def _cast_columns(table, types):
+        """Cast the given columns; ISO date strings become date32 via timestamp"""
+        for name, column_type in types.items():
+            i = table.schema.get_field_index(name)
+            column = table.column(i)
+            if pa.types.is_date(column_type) and pa.types.is_string(column.type):
+                column = column.cast(pa.timestamp("s"))
+            table = table.set_column(i, name, column.cast(column_type))
+        return table
+
+    @staticmethod
+    def _dictionary_encode(table, columns):
+        """Swap the given string columns for dictionary-encoded ones"""
+        for name in columns:
+            i = table.schema.get_field_index(name)
+            table = table.set_column(i, name, table.column(i).dictionary_encode())
+        return table
+
+    @staticmethod
+    def _to_arrow(data):
+        """Build an Arrow table from a DataFrame or a list of row dicts"""
+        if isinstance(data, pd.DataFrame):
+            return pa.Table.from_pandas(data, preserve_index=False)
+        return pa.Table.from_pylist(data)
+
+    @staticmethod
+    def _flatten_for_csv(table):
+        """Make a table writable by the Arrow CSV writer, which only takes flat
+        columns: dictionary columns are decoded, nested values (sensor
+        metadata) go out as JSON text and all-null columns as empty strings"""
+        for i, field in enumerate(table.schema):
+            if pa.types.is_dictionary(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(field.type.value_type))
+            elif pa.types.is_nested(field.type):
+                encoded = [
+                    orjson.dumps(v).decode() if v is not None else None
+                    for v in table.column(i).to_pylist()
+                ]
+                table = table.set_column(i, field.name, pa.array(encoded, type=pa.string()))
+            elif pa.types.is_null(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+        return table
+
+    def generate_full_dataset(self, num_campaigns=500):
         """Generate complete dataset for CES monitoring"""
         print("🚀 Starting full dataset generation...")
         
         # Generate core data
         print("\n📊 Generating campaigns...")
-        campaigns = self.generate_campaigns(500)
-        self.save_to_json(campaigns, "campaigns")
-        self.save_to_csv(campaigns, "campaigns")
-        
-        print("\n📈 Generating performance metrics...")
-        metrics = self.generate_performance_metrics(campaigns)
-        self.save_to_json(metrics, "performance_metrics")
-        self.save_to_csv(metrics, "performance_metrics")
+        campaigns = self.generate_campaigns(num_campaigns)
         
         print("\n🎨 Generating creative assets...")
         assets = self.generate_creative_assets(campaigns)
-        self.save_to_json(assets, "creative_assets")
-        self.save_to_csv(assets, "creative_assets")
         
         print("\n🔍 Generating sensor monitoring data...")
         sensors = self.generate_sensors_data()
-        self.save_to_json(sensors, "sensor_data")
-        self.save_to_csv(sensors, "sensor_data")
         
         print("\n🤖 Generating model performance data...")
         models = self.generate_model_performance()
-        self.save_to_json(models, "model_performance")
-        self.save_to_csv(models, "model_performance")
+        
+        # Every table is written independently, so overlap the file writes.
+        # Metrics are generated lazily inside their own write task; it is the
+        # only task drawing from self.rng once the pool starts.
+        print("\n📈 Generating performance metrics and writing outputs...")
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            metrics_future = executor.submit(
+                self.save_stream, self.iter_performance_metrics(campaigns), "performance_metrics",
+                parquet_types=METRIC_PARQUET_TYPES
+            )
+            writes = [
+                executor.submit(self.save, data, filename)
+                for data, filename in [
+                    (campaigns, "campaigns"),
+                    (assets, "creative_assets"),
+                    (sensors, "sensor_data"),
+                    (models, "model_performance")
+                ]
+            ]
+            for write in writes:
+                write.result()
+            metrics_count = metrics_future.result()
         
         # Generate summary statistics
         summary = {
             "generation_timestamp": datetime.now().isoformat(),
             "total_campaigns": len(campaigns),
-            "total_metrics": len(metrics),
+            "total_metrics": metrics_count,
             "total_assets": len(assets),
             "total_sensors": len(sensors),
             "total_models": len(models),
@@ -280,7 +595,7 @@ class FullDatasetGenerator:
                 "start": min(c["start_date"] for c in campaigns),
                 "end": max(c["end_date"] for c in campaigns)
             },
-            "tenants": ["tbwa", "ces", "scout"],
+            "tenants": self.tenants,
             "brands": self.brands,
             "industries": self.industries
         }
@@ -289,8 +604,33 @@ class FullDatasetGenerator:
         
         print(f"\n🎉 Full dataset generation complete!")
         print(f"📁 Files saved to: {self.output_dir.absolute()}")
-        print(f"📊 Total records: {sum([len(campaigns), len(metrics), len(assets), len(sensors), len(models)])}")
+        print(f"📊 Total records: {sum([len(campaigns), metrics_count, len(assets), len(sensors), len(models)])}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate mock CES campaign datasets")
+    parser.add_argument(
+        "--formats",
+        default=",".join(DEFAULT_FORMATS),
+        help=(
+            f"Comma-separated output formats from {', '.join(OUTPUT_FORMATS)} "
+            f"(default: %(default)s). The dashboard reads the JSON files; CSV is "
+            f"several times slower to write than Parquet at these row counts."
+        )
+    )
+    parser.add_argument(
+        "--num-campaigns",
+        type=int,
+        default=500,
+        help="Number of campaigns to generate (default: %(default)s)"
+    )
+    args = parser.parse_args()
+    args.formats = [f.strip() for f in args.formats.split(",") if f.strip()]
+    unknown = set(args.formats) - set(OUTPUT_FORMATS)
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(sorted(unknown))}")
+    return args
 
 if __name__ == "__main__":
-    generator = FullDatasetGenerator()
-    generator.generate_full_dataset()
\ No newline at end of file
+    args = parse_args()
+    generator = FullDatasetGenerator(formats=args.formats)
+    generator.generate_full_dataset(num_campaigns=args.num_campaigns)
\ No newline at end of file
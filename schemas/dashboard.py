@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 from typing import List, Dict, Optional, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from datetime import datetime
 from enum import Enum
 
@@ -28,8 +28,14 @@ class MetricType(Enum):
     PERCENTAGE = "percentage"
     RATIO = "ratio"
 
+# Dashboard building blocks are built once and never modified. Enum fields
+# store their plain value at validation so serialization skips the Enum hop.
+DASHBOARD_ITEM_CONFIG = ConfigDict(frozen=True, extra='forbid', use_enum_values=True)
+
 class DashboardMetric(BaseModel):
     """Base class for dashboard metrics."""
+    model_config = DASHBOARD_ITEM_CONFIG
+
     id: str
     name: str
     description: str
@@ -41,6 +47,8 @@ class DashboardMetric(BaseModel):
 
 class AssetDistribution(BaseModel):
     """Asset type distribution metrics."""
+    model_config = DASHBOARD_ITEM_CONFIG
+
     total_assets: int
     by_type: Dict[str, int]
     by_owner: Dict[str, int]
@@ -51,6 +59,8 @@ class AssetDistribution(BaseModel):
 
 class TimeSeriesMetric(BaseModel):
     """Time-based metric for trend analysis."""
+    model_config = DASHBOARD_ITEM_CONFIG
+
     metric_name: str
     values: List[float]
     timestamps: List[datetime]
@@ -59,6 +69,8 @@ class TimeSeriesMetric(BaseModel):
 
 class DashboardChart(BaseModel):
     """Chart configuration for dashboard."""
+    model_config = DASHBOARD_ITEM_CONFIG
+
     id: str
     title: str
     description: str
@@ -69,10 +81,13 @@ class DashboardChart(BaseModel):
     color_by: Optional[str] = None
     size_by: Optional[str] = None
     filters: Optional[Dict[str, Any]] = None
-    time_range: TimeRange = TimeRange.MONTH
+    # Defaults skip validation, so use_enum_values doesn't apply; store the value
+    time_range: TimeRange = TimeRange.MONTH.value
 
 class DashboardPanel(BaseModel):
     """Dashboard panel configuration."""
+    model_config = DASHBOARD_ITEM_CONFIG
+
     id: str
     title: str
     description: str
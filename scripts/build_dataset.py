@@ -1,18 +1,25 @@
 #!/usr/bin/env python3
-import json
 import csv
 import os
 import sys
+import threading
+import time
 from collections import deque, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Optional, Set
-import uuid
+from queue import Full, Queue
+from typing import Dict, List
+
+import orjson
 
 # ——— CONFIG ———
 INPUT_JSON = 'tbwa_drive_tree.json'
 OUTPUT_CSV = 'dataset_campaign_assets.csv'
 CHECKPOINT = '.build_checkpoint.json'
-CHECKPOINT_INTERVAL = 500  # Save checkpoint every N rows
+WRITE_BATCH_ROWS = 5000  # Rows buffered per writerows call
+PIPELINE_DEPTH = 4  # Row batches built ahead of the writer
+CHECKPOINT_SECONDS = 5.0  # Minimum time between checkpoints
+WRITE_BUFFER = 1 << 20  # 1 MB output buffer
 FOLDER_MIME = 'application/vnd.google-apps.folder'
 
 # File type mappings
@@ -40,12 +47,13 @@ class DriveTreeProcessor:
     def __init__(self, input_json: str, output_csv: str):
         self.input_json = input_json
         self.output_csv = output_csv
-        self.parent_map = defaultdict(list)  # child_id -> [parent_id,...]
+        self.parent_map: Dict[str, List[str]] = {}  # child_id -> [parent_id,...]
         self.name_map = {}                   # id -> name
         self.mime_map = {}                   # id -> mimeType
         self.modified_map = {}               # id -> modifiedTime
         self.size_map = {}                   # id -> size
         self.campaign_folders: Dict[str, str] = {}  # id -> name
+        self.campaign_of: Dict[str, str] = {}  # file id -> campaign name
         self.tenant_map: Dict[str, str] = {}  # campaign -> tenant
         self.stats = {
             'total_files': 0,
@@ -57,8 +65,8 @@ class DriveTreeProcessor:
     def load_checkpoint(self) -> Dict:
         """Load checkpoint if it exists."""
         if os.path.exists(CHECKPOINT):
-            with open(CHECKPOINT, 'r') as f:
-                return json.load(f)
+            with open(CHECKPOINT, 'rb') as f:
+                return orjson.loads(f.read())
         return {"last_idx": -1, "timestamp": None}
 
     def save_checkpoint(self, idx: int):
@@ -68,8 +76,11 @@ class DriveTreeProcessor:
             "timestamp": datetime.utcnow().isoformat(),
             "stats": self.stats
         }
-        with open(CHECKPOINT, 'w') as f:
-            json.dump(state, f, indent=2)
+        # Write to a temp file and swap it in so a crash never leaves a torn checkpoint
+        tmp = CHECKPOINT + '.tmp'
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps(state, option=orjson.OPT_INDENT_2))
+        os.replace(tmp, CHECKPOINT)
 
     def load_data(self, resume: bool = False):
         """Load and process the Drive tree JSON."""
@@ -88,19 +99,24 @@ class DriveTreeProcessor:
         else:
             start_idx = 0
         
-        with open(self.input_json, 'r') as f:
-            entries = json.load(f)
+        with open(self.input_json, 'rb') as f:
+            entries = orjson.loads(f.read())
 
-        # Build lookups
+        # Build lookups (maps bound to locals to skip attribute loads per entry)
+        name_map = self.name_map
+        mime_map = self.mime_map
+        modified_map = self.modified_map
+        size_map = self.size_map
+        parent_map = self.parent_map
         for e in entries:
             file_id = e['id']
-            self.name_map[file_id] = e['name']
-            self.mime_map[file_id] = e['mimeType']
-            self.modified_map[file_id] = e.get('modifiedTime', '')
-            self.size_map[file_id] = e.get('size', 0)
-            
-            for p in e.get('parents', []):
-                self.parent_map[file_id].append(p)
+            name_map[file_id] = e['name']
+            mime_map[file_id] = e['mimeType']
+            modified_map[file_id] = e.get('modifiedTime', '')
+            size_map[file_id] = e.get('size', 0)
+            parents = e.get('parents')
+            if parents:
+                parent_map[file_id] = parents
 
         # Find campaign folders
         self.campaign_folders = {
@@ -109,6 +125,8 @@ class DriveTreeProcessor:
             if mt == FOLDER_MIME and 'root' in self.parent_map.get(fid, [])
         }
 
+        self.campaign_of = self.map_campaigns()
+
         # Build tenant mapping
         self.tenant_map = {
             name: TENANT_MAPPING.get(name, TENANT_MAPPING['default'])
@@ -118,25 +136,102 @@ class DriveTreeProcessor:
         self.stats['total_files'] = len(entries)
         print(f"✅ Loaded {len(entries)} files, found {len(self.campaign_folders)} campaign folders")
 
-    def resolve_campaign(self, file_id: str) -> Optional[str]:
-        """Walk up the tree to find the campaign folder."""
-        visited: Set[str] = set()
-        queue = deque(self.parent_map.get(file_id, []))
-        
+    def map_campaigns(self) -> Dict[str, str]:
+        """Walk down from the campaign folders once to find each file's campaign."""
+        children_map = defaultdict(list)
+        for child, parents in self.parent_map.items():
+            for p in parents:
+                children_map[p].append(child)
+
+        # Multi-source BFS: every file gets its nearest campaign folder
+        owner = dict(self.campaign_folders)
+        campaign_of = {}
+        queue = deque(self.campaign_folders)
         while queue:
             pid = queue.popleft()
-            if pid in self.campaign_folders:
-                return self.campaign_folders[pid]
-            if pid in visited:
-                continue
-            visited.add(pid)
-            queue.extend(self.parent_map.get(pid, []))
-        return None
+            campaign = owner[pid]
+            for child in children_map.get(pid, ()):
+                if child not in owner:
+                    owner[child] = campaign
+                    campaign_of[child] = campaign
+                    queue.append(child)
+        return campaign_of
 
     def get_file_type(self, mime_type: str) -> str:
         """Map MIME type to friendly file type."""
         return FILE_TYPES.get(mime_type, 'other')
 
+    def _produce_batches(self, start_idx: int, batches: Queue, stop: threading.Event):
+        """Build CSV row batches for write_dataset on a worker thread.
+
+        Puts (rows, last_idx, skipped, errors) tuples of up to WRITE_BATCH_ROWS
+        rows on the queue, then None once every file has been seen. Stats are
+        applied by the writer so checkpoints only count written rows.
+        """
+        def put(item) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.5)
+                    return True
+                except Full:
+                    pass
+            return False
+
+        # Rows share one created_at
+        created_at = datetime.utcnow().isoformat()
+
+        # Lookups bound to locals (inlines get_file_type) for the hot loop
+        campaign_of_get = self.campaign_of.get
+        mime_map = self.mime_map
+        file_type_get = FILE_TYPES.get
+        tenant_get = self.tenant_map.get
+        size_get = self.size_map.get
+        modified_get = self.modified_map.get
+        default_tenant = TENANT_MAPPING['default']
+
+        batch = []
+        skipped = errors = 0
+        idx = start_idx - 1
+        try:
+            for idx, (fid, name) in enumerate(self.name_map.items()):
+                # Skip up to start_idx when resuming
+                if idx < start_idx:
+                    continue
+
+                try:
+                    campaign = campaign_of_get(fid)
+                    if not campaign:
+                        skipped += 1
+                        continue
+
+                    mime = mime_map[fid]
+                    batch.append((
+                        fid,
+                        name,
+                        file_type_get(mime, 'other'),
+                        mime,
+                        campaign,
+                        tenant_get(campaign, default_tenant),
+                        size_get(fid, 0),
+                        modified_get(fid, ''),
+                        created_at
+                    ))
+
+                    if len(batch) >= WRITE_BATCH_ROWS:
+                        if not put((batch, idx, skipped, errors)):
+                            return
+                        batch = []
+                        skipped = errors = 0
+
+                except Exception as e:
+                    print(f"⚠️  Error processing file {fid}: {str(e)}")
+                    errors += 1
+
+            if batch or skipped or errors:
+                put((batch, idx, skipped, errors))
+        finally:
+            put(None)
+
     def write_dataset(self, resume: bool = False):
         """Write the processed dataset to CSV."""
         print(f"📝 Writing dataset to {self.output_csv}...")
@@ -150,13 +245,13 @@ class DriveTreeProcessor:
         
         # Open file in append mode if resuming
         mode = 'a' if resume else 'w'
-        with open(self.output_csv, mode, newline='', encoding='utf-8') as out:
+        with open(self.output_csv, mode, newline='', encoding='utf-8', buffering=WRITE_BUFFER) as out:
             writer = csv.writer(out)
             
             # Write header only for new files
             if not resume:
+                # asset_id is left to the database default
                 writer.writerow([
-                    'asset_id',
                     'file_id',
                     'file_name',
                     'file_type',
@@ -168,42 +263,34 @@ class DriveTreeProcessor:
                     'created_at'
                 ])
             
-            # Process files
-            for idx, (fid, name) in enumerate(self.name_map.items()):
-                # Skip up to start_idx when resuming
-                if idx < start_idx:
-                    continue
-                
+            # A worker thread builds row batches while this thread writes
+            # them; a checkpoint follows a flush at most every
+            # CHECKPOINT_SECONDS
+            batches = Queue(maxsize=PIPELINE_DEPTH)
+            stop = threading.Event()
+            last_checkpoint = time.monotonic()
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                producer = executor.submit(self._produce_batches, start_idx, batches, stop)
                 try:
-                    campaign = self.resolve_campaign(fid)
-                    if not campaign:
-                        self.stats['skipped'] += 1
-                        continue
-                    
-                    writer.writerow([
-                        str(uuid.uuid4()),  # Generate new asset_id
-                        fid,
-                        name,
-                        self.get_file_type(self.mime_map[fid]),
-                        self.mime_map[fid],
-                        campaign,
-                        self.tenant_map.get(campaign, TENANT_MAPPING['default']),
-                        self.size_map.get(fid, 0),
-                        self.modified_map.get(fid, ''),
-                        datetime.utcnow().isoformat()
-                    ])
-                    
-                    self.stats['processed'] += 1
-                    
-                    # Save checkpoint periodically
-                    if (idx - start_idx + 1) % CHECKPOINT_INTERVAL == 0:
-                        self.save_checkpoint(idx)
-                        print(f"  • Checkpoint saved at index {idx}")
-                        print(f"  • Progress: {self.stats['processed']}/{self.stats['total_files']} files")
-                
-                except Exception as e:
-                    print(f"⚠️  Error processing file {fid}: {str(e)}")
-                    self.stats['errors'] += 1
+                    while (item := batches.get()) is not None:
+                        batch, idx, skipped, errors = item
+                        writer.writerows(batch)
+                        self.stats['processed'] += len(batch)
+                        self.stats['skipped'] += skipped
+                        self.stats['errors'] += errors
+
+                        # Save checkpoint once enough time has passed
+                        now = time.monotonic()
+                        if now - last_checkpoint >= CHECKPOINT_SECONDS:
+                            out.flush()
+                            self.save_checkpoint(idx)
+                            last_checkpoint = now
+                            print(f"  • Checkpoint saved at index {idx}")
+                            print(f"  • Progress: {self.stats['processed']}/{self.stats['total_files']} files")
+                finally:
+                    # Unblock the producer if writing failed
+                    stop.set()
+                producer.result()
         
         # On clean completion, remove checkpoint
         if os.path.exists(CHECKPOINT):
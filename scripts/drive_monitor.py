@@ -3,17 +3,27 @@ import os
 import json
 import subprocess
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from dataclasses import dataclass
 import logging
 from pathlib import Path
 
+import orjson
+from google.auth.exceptions import GoogleAuthError
+from google.oauth2 import service_account
+from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
+
 # ——— CONFIG ———
 RCLONE_CONFIG = os.getenv("RCLONE_CONFIG", "~/.config/rclone/rclone.conf")
 DRIVE_REMOTE = os.getenv("DRIVE_REMOTE", "tbwa-drive")
 ROOT_FOLDER = os.getenv("DRIVE_CAMPAIGN_ROOT_ID", "0AJMhu01UUQKoUk9PVA")
+DRIVE_SERVICE_ACCOUNT_FILE = os.getenv("DRIVE_SERVICE_ACCOUNT_FILE")
+FOLDER_MIME = "application/vnd.google-apps.folder"
+DOC_EXTENSIONS = (".pdf", ".doc", ".docx", ".xls", ".xlsx", ".ppt", ".pptx")
 LOG_DIR = Path("logs")
 CHECKPOINT_FILE = ".drive_monitor_checkpoint.json"
+PROCESSED_FILE = Path(".drive_monitor_processed.txt")  # One file ID per line, append-only
 
 # ——— LOGGING ———
 logging.basicConfig(
@@ -26,7 +36,7 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class DriveStats:
     total_files: int = 0
     total_size: int = 0
@@ -37,6 +47,8 @@ class DriveStats:
 class DriveMonitor:
     def __init__(self):
         self.stats = DriveStats()
+        self._drive = None
+        self._scan_ok: Optional[bool] = None  # Memoized _scan_drive result
         self.checkpoint = self._load_checkpoint()
         
         # Ensure log directory exists
@@ -50,20 +62,35 @@ class DriveMonitor:
             logger.error("❌ rclone is not installed or not in PATH")
             raise
 
+        # The Drive API listing needs a service account key
+        if not DRIVE_SERVICE_ACCOUNT_FILE:
+            logger.error("❌ DRIVE_SERVICE_ACCOUNT_FILE is not set")
+            raise RuntimeError("DRIVE_SERVICE_ACCOUNT_FILE must point to a service account key file")
+
     def _load_checkpoint(self) -> Dict:
         """Load last checkpoint if it exists."""
+        checkpoint = {"last_run": None}
+        legacy_ids = []
         if os.path.exists(CHECKPOINT_FILE):
-            with open(CHECKPOINT_FILE, 'r') as f:
-                return json.load(f)
-        return {"last_run": None, "processed_files": set()}
+            with open(CHECKPOINT_FILE, 'rb') as f:
+                saved = orjson.loads(f.read())
+            checkpoint["last_run"] = saved.get("last_run")
+            # Older checkpoints kept the IDs in a JSON array
+            legacy_ids = saved.get("processed_files", [])
+        if legacy_ids and not PROCESSED_FILE.exists():
+            PROCESSED_FILE.write_text("".join(f"{fid}\n" for fid in legacy_ids))
+        checkpoint["processed_files"] = (
+            set(PROCESSED_FILE.read_text().splitlines())
+            if PROCESSED_FILE.exists() else set()
+        )
+        return checkpoint
 
     def _save_checkpoint(self):
-        """Save current checkpoint."""
-        with open(CHECKPOINT_FILE, 'w') as f:
-            json.dump({
-                "last_run": datetime.utcnow().isoformat(),
-                "processed_files": list(self.checkpoint["processed_files"])
-            }, f)
+        """Save current checkpoint; processed file IDs live in PROCESSED_FILE."""
+        tmp = CHECKPOINT_FILE + ".tmp"
+        with open(tmp, 'wb') as f:
+            f.write(orjson.dumps({"last_run": datetime.utcnow().isoformat()}))
+        os.replace(tmp, CHECKPOINT_FILE)
 
     def _run_rclone(self, cmd: List[str]) -> Dict:
         """Run rclone command and parse JSON output."""
@@ -71,44 +98,106 @@ class DriveMonitor:
             result = subprocess.run(
                 ["rclone"] + cmd,
                 check=True,
-                capture_output=True,
-                text=True
+                capture_output=True
             )
-            return json.loads(result.stdout)
+            return orjson.loads(result.stdout)
         except subprocess.CalledProcessError as e:
-            logger.error(f"❌ rclone command failed: {e.stderr}")
+            logger.error(f"❌ rclone command failed: {e.stderr.decode(errors='replace')}")
             self.stats.error_count += 1
             return {}
-        except json.JSONDecodeError:
+        except orjson.JSONDecodeError:
             logger.error("❌ Failed to parse rclone output as JSON")
             self.stats.error_count += 1
             return {}
 
-    def check_folder_structure(self) -> bool:
-        """Verify folder structure and permissions."""
-        logger.info("🔍 Checking folder structure...")
-        
-        # List root folder
-        result = self._run_rclone([
-            "lsjson",
-            f"{DRIVE_REMOTE}:{ROOT_FOLDER}",
-            "--recursive",
-            "--files-only"
-        ])
+    def _drive_service(self):
+        """Drive API client, built once per monitor run."""
+        if self._drive is None:
+            creds = service_account.Credentials.from_service_account_file(
+                DRIVE_SERVICE_ACCOUNT_FILE,
+                scopes=["https://www.googleapis.com/auth/drive.metadata.readonly"]
+            )
+            self._drive = build("drive", "v3", credentials=creds, cache_discovery=False)
+        return self._drive
+
+    def _iter_drive_files(self) -> Iterator[Dict]:
+        """Yield every non-folder file in the campaign shared drive.
+
+        Pages are fetched one at a time (each needs the previous page's
+        token), so only one page of metadata is held in memory.
+        """
+        files = self._drive_service().files()
+        page_token = None
+        while True:
+            response = files.list(
+                corpora="drive",
+                driveId=ROOT_FOLDER,
+                includeItemsFromAllDrives=True,
+                supportsAllDrives=True,
+                q=f"mimeType != '{FOLDER_MIME}' and trashed = false",
+                fields="nextPageToken, files(id, name, size, modifiedTime, shared)",
+                pageSize=1000,
+                pageToken=page_token
+            ).execute()
+            yield from response.get("files", [])
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _scan_drive(self) -> bool:
+        """List the drive once and fill every listing-based stat.
+
+        The folder structure and permissions checks share this single pass;
+        the result is memoized for the rest of the run.
+        """
+        if self._scan_ok is not None:
+            return self._scan_ok
+        self._scan_ok = False
+
+        cutoff = datetime.utcnow().timestamp() - 86400  # 24 hours
+        total_files = total_size = modified_last_24h = shared_files = 0
+        try:
+            for f in self._iter_drive_files():
+                total_files += 1
+                # Native Google Docs have no size
+                total_size += int(f.get("size", 0))
+                # modifiedTime is RFC 3339 text, e.g. 2024-03-20T10:00:00.123Z
+                mod_time = f.get("modifiedTime")
+                if mod_time and datetime.fromisoformat(mod_time).timestamp() > cutoff:
+                    modified_last_24h += 1
+                # Sharing is only tracked for office documents
+                if f.get("shared", False) and f["name"].lower().endswith(DOC_EXTENSIONS):
+                    shared_files += 1
+        except HttpError as e:
+            logger.error(f"❌ Drive API request failed: {e}")
+            self.stats.error_count += 1
+            return False
+        except (GoogleAuthError, OSError) as e:
+            logger.error(f"❌ Drive credentials could not be loaded: {e}")
+            self.stats.error_count += 1
+            return False
+        except ValueError:
+            logger.error("❌ Failed to parse Drive file metadata")
+            self.stats.error_count += 1
+            return False
         
-        if not result:
+        if not total_files:
             return False
         
         # Update stats
-        self.stats.total_files = len(result)
-        self.stats.total_size = sum(f.get("Size", 0) for f in result)
+        self.stats.total_files = total_files
+        self.stats.total_size = total_size
+        self.stats.modified_last_24h = modified_last_24h
+        self.stats.shared_files = shared_files
+        self._scan_ok = True
+        return True
+
+    def check_folder_structure(self) -> bool:
+        """Verify folder structure and permissions."""
+        logger.info("🔍 Checking folder structure...")
         
-        # Check for recently modified files
-        cutoff = datetime.utcnow().timestamp() - 86400  # 24 hours
-        self.stats.modified_last_24h = sum(
-            1 for f in result 
-            if f.get("ModTime", 0) > cutoff
-        )
+        if not self._scan_drive():
+            return False
         
         logger.info(f"📊 Found {self.stats.total_files} files")
         logger.info(f"📊 Total size: {self.stats.total_size / 1024 / 1024:.1f} MB")
@@ -119,24 +208,9 @@ class DriveMonitor:
         """Check file sharing and permissions."""
         logger.info("🔒 Checking permissions...")
         
-        # Get sharing info
-        result = self._run_rclone([
-            "lsjson",
-            f"{DRIVE_REMOTE}:{ROOT_FOLDER}",
-            "--recursive",
-            "--files-only",
-            "--include", "*.{pdf,doc,docx,xls,xlsx,ppt,pptx}"
-        ])
-        
-        if not result:
+        if not self._scan_drive():
             return False
         
-        # Count shared files
-        self.stats.shared_files = sum(
-            1 for f in result 
-            if f.get("Shared", False)
-        )
-        
         logger.info(f"📊 Shared files: {self.stats.shared_files}")
         return True
 
@@ -148,7 +222,11 @@ class DriveMonitor:
             "check",
             f"{DRIVE_REMOTE}:{ROOT_FOLDER}",
             "--one-way",
-            "--checksum"
+            "--checksum",
+            # Hash/HEAD checks are latency bound, so run many in parallel
+            "--checkers=32",
+            "--transfers=16",
+            "--fast-list"
         ])
         
         if not result:
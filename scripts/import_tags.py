@@ -4,12 +4,15 @@ import sys
 import csv
 import uuid
 from datetime import datetime
-from sqlalchemy import text
+from sqlalchemy import column, table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.db import get_db
+from backend.db import get_db, set_tenant
+
+TAGS = table('tags', column('tag_id'), column('name'), column('description'), column('tenant_id'))
 
 def import_tags_from_csv(csv_path: str, tenant_id: str = 'scout'):
     """Import tags from a CSV file.
@@ -23,48 +26,41 @@ def import_tags_from_csv(csv_path: str, tenant_id: str = 'scout'):
 
     try:
         # Set tenant context
-        db.execute(text(f"SET app.current_tenant = '{tenant_id}'"))
+        set_tenant(db, tenant_id)
 
-        # Read and import tags
+        # Read tags
         with open(csv_path) as f:
-            reader = csv.DictReader(f)
-            imported = 0
-            skipped = 0
-            
-            for row in reader:
-                # Check if tag already exists
-                existing = db.execute(
-                    text("SELECT tag_id FROM tags WHERE name = :name"),
-                    {"name": row["name"]}
-                ).fetchone()
-                
-                if existing:
-                    print(f"⏭️  Skipping existing tag: {row['name']}")
-                    skipped += 1
-                    continue
-                
-                # Create new tag
-                tag_id = str(uuid.uuid4())
-                db.execute(
-                    text("""
-                    INSERT INTO tags (tag_id, name, description, tenant_id)
-                    VALUES (:tag_id, :name, :description, :tenant_id)
-                    """),
-                    {
-                        "tag_id": tag_id,
-                        "name": row["name"],
-                        "description": row.get("description"),
-                        "tenant_id": tenant_id
-                    }
-                )
+            rows = [
+                {
+                    "tag_id": str(uuid.uuid4()),
+                    "name": row["name"],
+                    "description": row.get("description"),
+                    "tenant_id": tenant_id
+                }
+                for row in csv.DictReader(f)
+            ]
+
+        # Insert all tags in one statement; existing names are left alone
+        inserted = set()
+        if rows:
+            inserted = set(db.execute(
+                pg_insert(TAGS).values(rows).on_conflict_do_nothing().returning(TAGS.c.name)
+            ).scalars())
+
+        for row in rows:
+            if row["name"] in inserted:
                 print(f"✅ Imported tag: {row['name']}")
-                imported += 1
-            
-            db.commit()
-            print(f"\n📊 Import Summary:")
-            print(f"- Imported: {imported} tags")
-            print(f"- Skipped: {skipped} existing tags")
-            print(f"- Total: {imported + skipped} tags processed")
+            else:
+                print(f"⏭️  Skipping existing tag: {row['name']}")
+
+        imported = len(inserted)
+        skipped = len(rows) - imported
+
+        db.commit()
+        print(f"\n📊 Import Summary:")
+        print(f"- Imported: {imported} tags")
+        print(f"- Skipped: {skipped} existing tags")
+        print(f"- Total: {imported + skipped} tags processed")
 
     except Exception as e:
         print(f"\n❌ Error during import: {str(e)}")
@@ -2,9 +2,18 @@
 from azure.keyvault.secrets import SecretClient
 from azure.identity import DefaultAzureCredential
 import os
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from dotenv import load_dotenv
 
+def _fetch_secret(client, secret_name):
+    """Fetch one secret value, or None if it can't be read."""
+    try:
+        return client.get_secret(secret_name).value
+    except Exception as e:
+        print(f"⚠️ Could not fetch {secret_name}: {str(e)}")
+        return None
+
 def load_secrets_from_keyvault():
     """Load secrets from Azure Key Vault and create .env file."""
     # Get Key Vault URL from environment or use default
@@ -30,14 +39,17 @@ def load_secrets_from_keyvault():
             "JWT_SECRET"
         ]
 
-        # Create .env content
-        env_content = []
-        for secret_name in secrets:
-            try:
-                secret_value = client.get_secret(secret_name).value
-                env_content.append(f"{secret_name}={secret_value}")
-            except Exception as e:
-                print(f"⚠️ Could not fetch {secret_name}: {str(e)}")
+        # Fetch concurrently; SecretClient is thread-safe, so the total
+        # wait is one round-trip instead of one per secret
+        with ThreadPoolExecutor(max_workers=len(secrets)) as executor:
+            values = executor.map(lambda name: _fetch_secret(client, name), secrets)
+
+            # Create .env content
+            env_content = [
+                f"{secret_name}={secret_value}"
+                for secret_name, secret_value in zip(secrets, values)
+                if secret_value is not None
+            ]
 
         # Write to .env file
         env_path = Path(".env")
@@ -8,7 +8,7 @@ from sqlalchemy import text
 # Add the parent directory to Python path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from backend.db import get_db
+from backend.db import get_db, set_tenant
 
 # Initial tags to seed
 INITIAL_TAGS = [
@@ -55,26 +55,28 @@ def seed_tags():
 
     try:
         # Set tenant context (using 'scout' as default)
-        db.execute(text("SET app.current_tenant = 'scout'"))
+        set_tenant(db, 'scout')
 
-        # Insert tags
-        for tag_data in INITIAL_TAGS:
-            tag_id = str(uuid.uuid4())
-            db.execute(
-                text("""
-                INSERT INTO tags (tag_id, name, description, tenant_id)
-                VALUES (:tag_id, :name, :description, 'scout')
-                """),
+        # Insert tags (a list of parameter sets runs as one executemany)
+        db.execute(
+            text("""
+            INSERT INTO tags (tag_id, name, description, tenant_id)
+            VALUES (:tag_id, :name, :description, 'scout')
+            """),
+            [
                 {
-                    "tag_id": tag_id,
+                    "tag_id": str(uuid.uuid4()),
                     "name": tag_data["name"],
                     "description": tag_data["description"]
                 }
-            )
+                for tag_data in INITIAL_TAGS
+            ]
+        )
         db.commit()
 
-        # Verify tags were created
+        # Verify tags were created (the tenant setting ends with each transaction)
         print("\n🔍 Verifying tags...")
+        set_tenant(db, 'scout')
         tags = db.execute(text("SELECT * FROM tags ORDER BY name")).fetchall()
         print(f"Created {len(tags)} tags:")
         for tag in tags:
@@ -83,12 +85,12 @@ def seed_tags():
         # Test RLS
         print("\n🔒 Testing tenant isolation...")
         # Try to access tags as a different tenant
-        db.execute(text("SET app.current_tenant = 'agency123'"))
+        set_tenant(db, 'agency123')
         other_tenant_tags = db.execute(text("SELECT * FROM tags")).fetchall()
         print(f"Tags visible to other tenant: {len(other_tenant_tags)}")
 
         # Switch back to scout tenant
-        db.execute(text("SET app.current_tenant = 'scout'"))
+        set_tenant(db, 'scout')
         scout_tags = db.execute(text("SELECT * FROM tags")).fetchall()
         print(f"Tags visible to scout tenant: {len(scout_tags)}")
 
@@ -18,6 +18,8 @@ class DriveAccessVerifier:
         self.creds = None
         self.service = None
         self.root_id = None
+        self.root_folder = None
+        self.root_error = None
 
     def check_env(self) -> bool:
         """Verify all required environment variables are set."""
@@ -53,13 +55,33 @@ class DriveAccessVerifier:
             self.service = build("drive", "v3", credentials=self.creds)
             self.root_id = os.getenv("DRIVE_CAMPAIGN_ROOT_ID")
             
-            # Try to list files in root
-            result = self.service.files().list(
+            # List a few children and fetch the folder's own capabilities in
+            # one batched HTTP round-trip; verify_permissions reuses the latter
+            responses = {}
+
+            def collect(request_id, response, exception):
+                responses[request_id] = (response, exception)
+
+            batch = self.service.new_batch_http_request(callback=collect)
+            batch.add(self.service.files().list(
                 q=f"'{self.root_id}' in parents and trashed=false",
                 pageSize=5,
-                fields="files(id, name, mimeType)"
-            ).execute()
-            
+                fields="files(id, name, mimeType)",
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True
+            ), request_id="children")
+            batch.add(self.service.files().get(
+                fileId=self.root_id,
+                fields="id, name, capabilities(canListChildren)",
+                supportsAllDrives=True
+            ), request_id="folder")
+            batch.execute()
+
+            self.root_folder, self.root_error = responses["folder"]
+            result, error = responses["children"]
+            if error is not None:
+                raise error
+
             files = result.get("files", [])
             if not files:
                 print("⚠️  No files found in root folder")
@@ -80,12 +102,14 @@ class DriveAccessVerifier:
     def verify_permissions(self) -> bool:
         """Verify we have the right permissions on the root folder."""
         try:
-            # Try to get folder metadata
-            folder = self.service.files().get(
-                fileId=self.root_id,
-                fields="id, name, capabilities"
-            ).execute()
-            
+            # Folder metadata came back with the listing batch
+            if self.root_error is not None:
+                raise self.root_error
+            folder = self.root_folder
+            if folder is None:
+                print("❌ Root folder metadata unavailable")
+                return False
+
             caps = folder.get("capabilities", {})
             if not caps.get("canListChildren", False):
                 print("❌ No permission to list folder contents")
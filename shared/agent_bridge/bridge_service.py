@@ -1,39 +1,212 @@
-from typing import Dict, List, Optional
-import json
+from typing import Any, Dict, List, Mapping, Optional, Union
 import asyncio
+import os
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from fastapi import FastAPI, WebSocket
+import orjson
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import TypeAdapter
+from ..async_utils import to_thread_fast
 from ..memory_sync.memory_service import MemoryService
 from ..mcp.mcp_service import MCPService
 
+# Incoming messages are stored in batches of up to this many rows,
+# or whatever arrived within the flush window
+MEMORY_FLUSH_ROWS = 1000
+MEMORY_FLUSH_SECONDS = 0.05
+# Messages queued for one agent are merged into a single frame, up to this many
+SEND_BATCH_MAX = 64
+# Threads for blocking DB calls; asyncio's own default (cpu+4, up to 32) can
+# exceed what the memory store's connection pool can serve at once
+BRIDGE_WORKER_THREADS = int(os.getenv('BRIDGE_WORKER_THREADS', min(8, (os.cpu_count() or 1) * 2)))
+# zlib level for pre-compressed broadcasts
+BROADCAST_COMPRESS_LEVEL = 6
+
+# Built once at import; incoming frames are parsed and checked to be JSON
+# objects in a single pydantic-core pass
+_MESSAGE_ADAPTER = TypeAdapter(Dict[str, Any])
+
+def _json_default(obj: Any):
+    # Memory rows come back as SQLAlchemy RowMappings
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError
+
+def encode_message(message: Dict) -> str:
+    """Serialize a message once with orjson for any number of sockets."""
+    # Sent as text frames so existing JSON clients keep working
+    return orjson.dumps(message, default=_json_default).decode()
+
+def _multi_frame(payloads: List[str]) -> str:
+    # Splice already-encoded messages instead of decoding and re-encoding
+    return '{"type":"multi","payload":[' + ",".join(payloads) + "]}"
+
+def _frames(payloads: List[Union[str, bytes]]):
+    """Group queued payloads into frames, preserving order.
+
+    Consecutive text payloads merge into one multi frame; pre-compressed
+    binary payloads are sent as they are.
+    """
+    texts: List[str] = []
+    for payload in payloads:
+        if isinstance(payload, bytes):
+            if texts:
+                yield texts[0] if len(texts) == 1 else _multi_frame(texts)
+                texts = []
+            yield payload
+        else:
+            texts.append(payload)
+    if texts:
+        yield texts[0] if len(texts) == 1 else _multi_frame(texts)
+
+def decode_frame(data: Union[str, bytes]) -> List[Dict]:
+    """Client-side decoder: the messages carried by one bridge frame."""
+    # Compressed broadcasts are zlib streams; JSON never starts with 'x'
+    if isinstance(data, bytes) and data[:1] == b"x":
+        data = zlib.decompress(data)
+    message = orjson.loads(data)
+    if message.get("type") == "multi":
+        return message["payload"]
+    return [message]
+
+async def receive_message(websocket: WebSocket) -> Dict:
+    """Read one JSON message from a text or binary frame."""
+    frame = await websocket.receive()
+    if frame["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(frame.get("code", 1000))
+    data = frame.get("bytes")
+    return _MESSAGE_ADAPTER.validate_json(data if data is not None else frame["text"])
+
 class AgentBridge:
-    def __init__(self):
-        self.app = FastAPI()
-        self.memory_service = MemoryService()
-        self.mcp_service = MCPService()
+    def __init__(self, memory_service: Optional[MemoryService] = None,
+                 mcp_service: Optional[MCPService] = None):
+        self.app = FastAPI(default_response_class=ORJSONResponse)
+        # Services can be shared with other components instead of rebuilt
+        self.memory_service = memory_service or MemoryService()
+        self.mcp_service = mcp_service or MCPService()
         self.active_connections: Dict[str, WebSocket] = {}
+        # Per-agent queues of encoded messages, drained by one writer task each
+        self._outboxes: Dict[str, asyncio.Queue] = {}
+        self._writers: Dict[str, asyncio.Task] = {}
+        self._mem_queue: asyncio.Queue = asyncio.Queue()
+        self._mem_flusher: Optional[asyncio.Task] = None
+        self.app.add_event_handler("startup", self._install_executor)
+        self.app.add_event_handler("shutdown", self.flush_memories)
+
+    async def _install_executor(self):
+        """Size the loop's default executor, which runs the offloaded DB calls."""
+        asyncio.get_running_loop().set_default_executor(
+            ThreadPoolExecutor(max_workers=BRIDGE_WORKER_THREADS, thread_name_prefix="bridge")
+        )
+
+    def _ensure_memory_flusher(self):
+        """Start the background memory writer on the running loop."""
+        if self._mem_flusher is None or self._mem_flusher.done():
+            self._mem_flusher = asyncio.create_task(self._memory_flusher())
+
+    async def _memory_flusher(self):
+        """Drain queued memories and write each batch with one insert."""
+        loop = asyncio.get_running_loop()
+        while True:
+            rows = [await self._mem_queue.get()]
+            deadline = loop.time() + MEMORY_FLUSH_SECONDS
+            while len(rows) < MEMORY_FLUSH_ROWS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    rows.append(await asyncio.wait_for(self._mem_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            try:
+                # Off the event loop so the insert never stalls WebSocket traffic
+                await to_thread_fast(self.memory_service.store_memories, rows)
+            except Exception as e:
+                print(f"Error storing memories: {e}")
+            finally:
+                for _ in rows:
+                    self._mem_queue.task_done()
+
+    async def flush_memories(self):
+        """Wait until every queued memory has been written."""
+        if self._mem_flusher is not None and not self._mem_flusher.done():
+            await self._mem_queue.join()
 
     async def connect(self, websocket: WebSocket, agent_id: str):
         """Connect an agent to the bridge."""
         await websocket.accept()
         self.active_connections[agent_id] = websocket
+        previous = self._writers.get(agent_id)
+        if previous is not None:
+            previous.cancel()
+        outbox = self._outboxes[agent_id] = asyncio.Queue()
+        self._writers[agent_id] = asyncio.create_task(
+            self._writer(agent_id, websocket, outbox)
+        )
 
     async def disconnect(self, agent_id: str):
         """Disconnect an agent from the bridge."""
-        if agent_id in self.active_connections:
-            del self.active_connections[agent_id]
+        self.active_connections.pop(agent_id, None)
+        self._outboxes.pop(agent_id, None)
+        writer = self._writers.pop(agent_id, None)
+        if writer is not None and writer is not asyncio.current_task():
+            writer.cancel()
+
+    async def _writer(self, agent_id: str, websocket: WebSocket, outbox: asyncio.Queue):
+        """Send an agent's queued messages, merging whatever is waiting into one frame."""
+        while True:
+            payloads = [await outbox.get()]
+            while len(payloads) < SEND_BATCH_MAX and not outbox.empty():
+                payloads.append(outbox.get_nowait())
+            try:
+                for frame in _frames(payloads):
+                    if isinstance(frame, bytes):
+                        await websocket.send_bytes(frame)
+                    else:
+                        await websocket.send_text(frame)
+            except Exception as e:
+                print(f"Error sending to {agent_id}: {e}")
+                await self.disconnect(agent_id)
+                return
+            finally:
+                for _ in payloads:
+                    outbox.task_done()
+
+    def _enqueue(self, agent_id: str, payload: str) -> bool:
+        outbox = self._outboxes.get(agent_id)
+        if outbox is None:
+            return False
+        outbox.put_nowait(payload)
+        return True
+
+    async def broadcast(self, message: Dict, compress: bool = False):
+        """Broadcast a message to all connected agents.
 
-    async def broadcast(self, message: Dict):
-        """Broadcast a message to all connected agents."""
-        for connection in self.active_connections.values():
-            await connection.send_json(message)
+        With compress, the message is zlib-compressed once and every agent
+        receives the same binary frame (see decode_frame); run the server
+        without permessage-deflate so it isn't compressed again per socket.
+        """
+        # Encode once; each agent's writer sends it alongside its other traffic
+        payload: Union[str, bytes] = encode_message(message)
+        if compress:
+            payload = zlib.compress(payload.encode(), BROADCAST_COMPRESS_LEVEL)
+        for outbox in self._outboxes.values():
+            outbox.put_nowait(payload)
+
+    async def send_batch(self, agent_id: str, messages: List[Dict]):
+        """Queue several messages for an agent; they go out as few frames."""
+        for message in messages:
+            if not self._enqueue(agent_id, encode_message(message)):
+                return
 
     async def send_to_agent(self, agent_id: str, message: Dict):
         """Send a message to a specific agent."""
-        if agent_id in self.active_connections:
-            await self.active_connections[agent_id].send_json(message)
-            # Store in memory for persistence
-            self.memory_service.send_message(
+        if self._enqueue(agent_id, encode_message(message)):
+            # Store in memory for persistence, off the event loop
+            await to_thread_fast(
+                self.memory_service.send_message,
                 sender_id=message.get('sender_id', 'system'),
                 receiver_id=agent_id,
                 message_type=message.get('type', 'message'),
@@ -42,17 +215,19 @@ class AgentBridge:
 
     async def handle_message(self, agent_id: str, message: Dict):
         """Handle incoming messages from agents."""
-        # Store in memory
-        self.memory_service.store_memory(
-            agent_id=agent_id,
-            memory_type='message',
-            content=message
-        )
+        # Queue for storage; the background flusher batches the inserts
+        self._ensure_memory_flusher()
+        await self._mem_queue.put({
+            'agent_id': agent_id,
+            'memory_type': 'message',
+            'content': message
+        })
 
         # Process based on message type
         if message.get('type') == 'sync_request':
-            # Handle sync request
-            memories = self.memory_service.get_memories(agent_id)
+            # Handle sync request; include everything queued so far
+            await self.flush_memories()
+            memories = await to_thread_fast(self.memory_service.get_memories, agent_id)
             await self.send_to_agent(agent_id, {
                 'type': 'sync_response',
                 'memories': memories
@@ -72,7 +247,7 @@ class AgentBridge:
             await self.connect(websocket, agent_id)
             try:
                 while True:
-                    message = await websocket.receive_json()
+                    message = await receive_message(websocket)
                     await self.handle_message(agent_id, message)
             except Exception as e:
                 print(f"Error handling message: {e}")
@@ -81,7 +256,12 @@ class AgentBridge:
 
         @self.app.get("/agents/{agent_id}/memories")
         async def get_agent_memories(agent_id: str):
-            return self.memory_service.get_memories(agent_id)
+            memories = await to_thread_fast(self.memory_service.get_memories, agent_id)
+            # Encoded once here; skips FastAPI's jsonable_encoder walk
+            return Response(
+                orjson.dumps(memories, default=_json_default),
+                media_type="application/json"
+            )
 
         @self.app.post("/agents/{agent_id}/message")
         async def send_agent_message(agent_id: str, message: Dict):
@@ -0,0 +1,18 @@
+import asyncio
+import contextvars
+import functools
+from typing import Any, Callable
+
+async def to_thread_fast(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """asyncio.to_thread without the context copy when there is nothing to copy.
+
+    With no context variables set, the call goes straight to the default
+    executor, skipping the Context.run and functools.partial wrappers.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+    if not ctx:
+        if kwargs:
+            func = functools.partial(func, **kwargs)
+        return await loop.run_in_executor(None, func, *args)
+    return await loop.run_in_executor(None, ctx.run, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,84 @@
+"""In-process Faiss stand-in for a Pinecone index.
+
+Implements the slice of the Pinecone ``Index`` API that MCPService uses
+(upsert, query, delete), so tests and local runs can skip the network.
+"""
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Sequence
+
+import faiss
+import numpy as np
+
+class FaissIndex:
+    """Exact inner-product index keyed by Pinecone-style string ids."""
+
+    def __init__(self, name: str, dimension: Optional[int] = None):
+        self.name = name
+        self.dimension = dimension
+        self._index: Optional[faiss.IndexIDMap2] = None
+        self._ids: Dict[str, int] = {}      # Pinecone id -> Faiss label
+        self._keys: Dict[int, str] = {}     # Faiss label -> Pinecone id
+        self._metadata: Dict[str, dict] = {}
+
+    def _ensure_index(self, dimension: int) -> faiss.IndexIDMap2:
+        if self._index is None:
+            self.dimension = self.dimension or dimension
+            # Flat rather than HNSW: upserts need remove_ids, and exact
+            # search is faster than a graph at test-sized corpora
+            self._index = faiss.IndexIDMap2(faiss.IndexFlatIP(self.dimension))
+        return self._index
+
+    def upsert(self, vectors: Sequence[tuple], metadata: Optional[dict] = None, **_):
+        if not vectors:
+            return
+        values = np.asarray([v[1] for v in vectors], dtype=np.float32)
+        index = self._ensure_index(values.shape[1])
+        labels = []
+        for item in vectors:
+            key = str(item[0])
+            label = self._ids.get(key)
+            if label is None:
+                label = self._ids[key] = len(self._ids)
+                self._keys[label] = key
+            labels.append(label)
+            self._metadata[key] = {**(metadata or {}), **(item[2] if len(item) > 2 else {})}
+        labels = np.asarray(labels, dtype=np.int64)
+        index.remove_ids(labels)
+        index.add_with_ids(values, labels)
+
+    def _search(self, queries: np.ndarray, top_k: int) -> List[SimpleNamespace]:
+        if self._index is None or self._index.ntotal == 0:
+            return [SimpleNamespace(matches=[]) for _ in queries]
+        scores, labels = self._index.search(queries, top_k)
+        results = []
+        for row_scores, row_labels in zip(scores, labels):
+            matches = []
+            for score, label in zip(row_scores, row_labels):
+                if label < 0:
+                    continue
+                key = self._keys[int(label)]
+                matches.append(SimpleNamespace(
+                    id=key,
+                    score=float(score),
+                    values=self._index.reconstruct(int(label)).tolist(),
+                    metadata=self._metadata.get(key, {})
+                ))
+            results.append(SimpleNamespace(matches=matches))
+        return results
+
+    def query(self, vector: Optional[Sequence[float]] = None,
+              queries: Optional[Sequence[Sequence[float]]] = None,
+              top_k: int = 10, **_):
+        if queries is not None:
+            return SimpleNamespace(
+                results=self._search(np.asarray(queries, dtype=np.float32), top_k)
+            )
+        return self._search(np.asarray([vector], dtype=np.float32), top_k)[0]
+
+    def delete(self, delete_all: bool = False, **_):
+        if delete_all and self._index is not None:
+            # reset() frees the stored vectors; nothing lingers across tests
+            self._index.reset()
+            self._ids.clear()
+            self._keys.clear()
+            self._metadata.clear()
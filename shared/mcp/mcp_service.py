@@ -1,13 +1,100 @@
-from typing import Dict, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import json
 import os
+import time
+from itertools import islice
+from functools import lru_cache
+import numpy as np
 from google.oauth2 import service_account
 from googleapiclient.discovery import build
 from azure.keyvault.secrets import SecretClient
 from azure.identity import DefaultAzureCredential
+from openai import OpenAI
 import pinecone
+from ..async_utils import to_thread_fast
+
+SECRET_TTL_SECONDS = 300  # Re-read Key Vault secrets after 5 minutes
+PINECONE_UPSERT_BATCH = 100  # Pinecone's recommended vectors per upsert
+PINECONE_QUERY_BATCH = 10    # Query vectors per request, well under the 2MB cap
+EMBEDDING_MODEL = os.getenv('OPENAI_EMBEDDING_MODEL', 'text-embedding-3-small')
+MAX_OPENAI_EMBEDDING_ARRAY_DIMENSIONS = 2048  # Inputs OpenAI accepts per embeddings request
+EMBEDDING_BATCH = 1000  # Inputs per request; keeps long memories under the token cap
+
+Vector = Union[Sequence[float], np.ndarray]
+
+def _values(vector: Vector) -> Sequence[float]:
+    """Vector values as the Pinecone client expects them.
+
+    Arrays stay float32 until here and are converted to a list once, at the
+    client boundary.
+    """
+    if isinstance(vector, np.ndarray):
+        return vector.astype(np.float32, copy=False).tolist()
+    return vector
+
+def quantize_int8(vectors: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Scalar-quantize rows to int8 codes plus one float32 scale per row.
+
+    Each row is scaled so its largest magnitude maps to 127; cosine
+    similarity is scale-invariant, so codes can be searched as stored.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    peak = np.abs(vectors).max(axis=-1, keepdims=True)
+    scales = np.divide(127.0, peak, out=np.ones_like(peak), where=peak > 0)
+    codes = np.rint(vectors * scales).astype(np.int8)
+    return codes, scales[..., 0]
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Approximate float32 vectors back from quantize_int8 output."""
+    return codes.astype(np.float32) / np.asarray(scales, dtype=np.float32)[..., None]
+
+@lru_cache(maxsize=None)
+def _drive_credentials(service_account_file: str):
+    """Service-account credentials, read from disk once per process."""
+    return service_account.Credentials.from_service_account_file(
+        service_account_file,
+        scopes=['https://www.googleapis.com/auth/drive']
+    )
+
+@lru_cache(maxsize=None)
+def _drive_service(service_account_file: str):
+    """Drive client per credentials file, built once per process.
+
+    build() uses the discovery document bundled with googleapiclient, so
+    nothing is fetched over the network.
+    """
+    return build(
+        'drive', 'v3',
+        credentials=_drive_credentials(service_account_file),
+        cache_discovery=False
+    )
 
 class MCPService:
-    def __init__(self):
+    def __init__(self, store_dtype: str = "float32", backend: str = "pinecone"):
+        # "int8" sends scalar-quantized vectors, for indexes where approximate
+        # recall is acceptable. It only shrinks the upsert payload (small
+        # integers encode shorter than floats): Pinecone and FaissIndex both
+        # still store float32, so index memory is unchanged.
+        if store_dtype not in ("float32", "int8"):
+            raise ValueError(f"Unsupported store_dtype: {store_dtype}")
+        self.store_dtype = store_dtype
+        # "faiss" keeps vectors in process (tests, local runs) and builds no
+        # cloud clients; Key Vault and Drive calls are unavailable in that mode
+        if backend not in ("pinecone", "faiss"):
+            raise ValueError(f"Unsupported vector backend: {backend}")
+        self.backend = backend
+
+        self._secret_cache: Dict[str, Tuple[str, float]] = {}  # name -> (value, fetched_at)
+        self._indexes: Dict[str, pinecone.Index] = {}
+        self._openai: Optional[OpenAI] = None  # Created on first embed
+
+        self.azure_credential = None
+        self.keyvault_client = None
+        self.drive_creds = None
+        self.drive_service = None
+        if backend == "faiss":
+            return
+
         # Initialize Azure
         self.azure_credential = DefaultAzureCredential()
         self.keyvault_client = SecretClient(
@@ -15,12 +102,10 @@ class MCPService:
             credential=self.azure_credential
         )
 
-        # Initialize Google Drive
-        self.drive_creds = service_account.Credentials.from_service_account_file(
-            os.getenv('DRIVE_SERVICE_ACCOUNT_FILE'),
-            scopes=['https://www.googleapis.com/auth/drive']
-        )
-        self.drive_service = build('drive', 'v3', credentials=self.drive_creds)
+        # Initialize Google Drive (shared across instances)
+        service_account_file = os.getenv('DRIVE_SERVICE_ACCOUNT_FILE')
+        self.drive_creds = _drive_credentials(service_account_file)
+        self.drive_service = _drive_service(service_account_file)
 
         # Initialize Pinecone
         pinecone.init(
@@ -28,31 +113,175 @@ class MCPService:
             environment=os.getenv('PINECONE_ENV')
         )
 
+    def _require_cloud(self, what: str):
+        if self.backend == "faiss":
+            raise RuntimeError(f"{what} is unavailable with the faiss backend")
+
+    def close(self):
+        """Release this service's pooled connections.
+
+        The Drive client is shared process-wide and stays open.
+        """
+        for index in self._indexes.values():
+            close = getattr(index, "close", None)
+            if close is not None:
+                close()
+        self._indexes.clear()
+        if self.keyvault_client is not None:
+            self.keyvault_client.close()
+            self.azure_credential.close()
+
     def get_azure_secret(self, secret_name: str) -> str:
-        """Get a secret from Azure Key Vault."""
-        return self.keyvault_client.get_secret(secret_name).value
+        """Get a secret from Azure Key Vault, cached for SECRET_TTL_SECONDS."""
+        self._require_cloud("Key Vault")
+        cached = self._secret_cache.get(secret_name)
+        now = time.monotonic()
+        if cached and now - cached[1] < SECRET_TTL_SECONDS:
+            return cached[0]
+        value = self.keyvault_client.get_secret(secret_name).value
+        self._secret_cache[secret_name] = (value, now)
+        return value
 
     def list_drive_files(self, folder_id: str) -> list:
         """List files in a Google Drive folder."""
+        self._require_cloud("Google Drive")
         results = self.drive_service.files().list(
             q=f"'{folder_id}' in parents and trashed=false",
             fields="files(id, name, mimeType)"
         ).execute()
         return results.get('files', [])
 
+    def _index(self, index_name: str) -> pinecone.Index:
+        """Pinecone index handle, connected once and reused."""
+        index = self._indexes.get(index_name)
+        if index is None:
+            if self.backend == "faiss":
+                # Optional dependency (pip install faiss-cpu), only needed
+                # for the local backend
+                from .faiss_backend import FaissIndex
+                index = FaissIndex(index_name)
+            else:
+                index = pinecone.Index(index_name)
+            self._indexes[index_name] = index
+        return index
+
+    def store_vectors(self, index_name: str, items: Iterable[Tuple],
+                      batch_size: int = PINECONE_UPSERT_BATCH,
+                      metadata: Optional[Dict] = None):
+        """Upsert (id, values) items into Pinecone, batch_size per request."""
+        index = self._index(index_name)
+        items = iter(items)
+        while True:
+            chunk = [
+                (item[0], _values(item[1]), *item[2:])
+                for item in islice(items, batch_size)
+            ]
+            if not chunk:
+                return
+            if self.store_dtype == "int8":
+                chunk = self._quantize_chunk(chunk)
+            index.upsert(vectors=chunk, metadata=metadata)
+
+    @staticmethod
+    def _quantize_chunk(chunk: List[Tuple]) -> List[Tuple]:
+        """int8 codes for a batch, with each row's scale kept in its metadata.
+
+        The codes go out as plain ints and the index stores them as float32;
+        the saving is on the wire only.
+        """
+        codes, scales = quantize_int8(np.array([item[1] for item in chunk]))
+        return [
+            (item[0], row.tolist(), {**(item[2] if len(item) > 2 else {}), "q_scale": float(scale)})
+            for item, row, scale in zip(chunk, codes, scales)
+        ]
+
+    def _dequantize(self, result):
+        """Restore float values on matches of an int8 index, client-side."""
+        if self.store_dtype != "int8":
+            return result
+        for match in getattr(result, "matches", None) or []:
+            scale = (match.metadata or {}).get("q_scale")
+            if match.values and scale:
+                match.values = (np.asarray(match.values, dtype=np.float32) / scale).tolist()
+        return result
+
+    def store_vector_bytes(self, index_name: str, ids: np.ndarray,
+                           vecs_bytes: Union[bytes, memoryview], dim: int = 1536):
+        """Upsert vectors packed as contiguous float32 bytes, one row per id.
+
+        The buffer is viewed in place; no per-vector Python lists are built
+        before the client boundary.
+        """
+        vectors = np.frombuffer(vecs_bytes, dtype=np.float32).reshape(-1, dim)
+        if len(vectors) != len(ids):
+            raise ValueError(f"{len(ids)} ids for {len(vectors)} vectors")
+        self.store_vectors(index_name, zip((str(i) for i in ids), vectors))
+
+    def query_vectors(self, index_name: str, vectors: Iterable[Vector], top_k: int = 5,
+                      batch_size: int = PINECONE_QUERY_BATCH) -> List:
+        """Query many vectors, batch_size per request.
+
+        Returns one result per input vector, in order.
+        """
+        index = self._index(index_name)
+        vectors = iter(vectors)
+        results = []
+        while True:
+            chunk = [_values(v) for v in islice(vectors, batch_size)]
+            if not chunk:
+                return results
+            results.extend(
+                self._dequantize(r)
+                for r in index.query(queries=chunk, top_k=top_k).results
+            )
+
+    def delete_namespace(self, index_name: str, namespace: Optional[str] = None):
+        """Delete every vector in one namespace of an index."""
+        self._index(index_name).delete(delete_all=True, namespace=namespace)
+
+    def embed_texts(self, texts: List[str], batch_size: int = EMBEDDING_BATCH) -> List[List[float]]:
+        """Embed texts with as few OpenAI requests as possible.
+
+        Returns one embedding per input, in order.
+        """
+        if self._openai is None:
+            self._openai = OpenAI()
+        batch_size = min(batch_size, MAX_OPENAI_EMBEDDING_ARRAY_DIMENSIONS)
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            response = self._openai.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=texts[start:start + batch_size]
+            )
+            embeddings.extend(item.embedding for item in response.data)
+        return embeddings
+
     def store_vector(self, index_name: str, vectors: list, metadata: Optional[Dict] = None):
         """Store vectors in Pinecone."""
-        index = pinecone.Index(index_name)
-        index.upsert(vectors=vectors, metadata=metadata)
+        self.store_vectors(index_name, vectors, metadata=metadata)
 
-    def query_vector(self, index_name: str, vector: list, top_k: int = 5) -> list:
+    def query_vector(self, index_name: str, vector: Vector, top_k: int = 5) -> list:
         """Query vectors from Pinecone."""
-        index = pinecone.Index(index_name)
-        return index.query(vector=vector, top_k=top_k)
+        return self._dequantize(
+            self._index(index_name).query(vector=_values(vector), top_k=top_k)
+        )
+
+    async def sync_across_clouds_async(self, source: str, destination: str, data: Dict):
+        """sync_across_clouds on a worker thread, so callers can overlap it
+        with other I/O on the event loop."""
+        await to_thread_fast(self.sync_across_clouds, source, destination, data)
 
     def sync_across_clouds(self, source: str, destination: str, data: Dict):
         """Sync data across different cloud providers."""
-        if source == 'drive' and destination == 'pinecone':
+        if source == 'memory' and destination == 'pinecone':
+            # Embed every memory in one batched pass, then upsert in batches
+            memories = data.get('memories', [])
+            embeddings = self.embed_texts([json.dumps(m['content']) for m in memories])
+            self.store_vectors(
+                'memory-embeddings',
+                ((str(m['id']), e) for m, e in zip(memories, embeddings))
+            )
+        elif source == 'drive' and destination == 'pinecone':
             # Example: Sync Drive document embeddings to Pinecone
             vectors = self._extract_vectors_from_drive(data['file_id'])
             self.store_vector('document-embeddings', vectors, metadata=data)
@@ -1,82 +1,180 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 import json
 from datetime import datetime
-from sqlalchemy import create_engine, text
+from functools import lru_cache
+import orjson
+import sqlalchemy as sa
+from sqlalchemy import column, create_engine, table, text
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 import os
 
+def _json_default(obj):
+    # Rows read back from agent_memory (e.g. inside a sync_response) are RowMappings
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError
+
+def _dumps_json(obj) -> str:
+    # orjson also encodes the rows' datetimes, which json.dumps rejects
+    return orjson.dumps(obj, default=_json_default).decode()
+
+@lru_cache(maxsize=None)
+def get_engine(database_url: str) -> Engine:
+    """One pooled engine per database URL, shared across the process."""
+    # Same sizing as backend.db's sync pool; the bridge offloads its DB
+    # calls to at most BRIDGE_WORKER_THREADS threads
+    return create_engine(
+        database_url,
+        pool_size=5,
+        max_overflow=10,
+        pool_timeout=30,
+        pool_recycle=300,
+        pool_pre_ping=True,
+        json_serializer=_dumps_json
+    )
+
+AGENT_MEMORY = table(
+    'agent_memory',
+    column('id', sa.Integer),
+    column('agent_id', sa.String),
+    column('memory_type', sa.String),
+    column('content', JSONB),
+)
+
+_SELECT_MEMORY = """
+SELECT id, memory_type, content, created_at, updated_at
+FROM agent_memory
+WHERE agent_id = :agent_id
+"""
+_MEMORY_TYPE_CLAUSE = " AND memory_type = :memory_type"
+# @> containment is served by the jsonb_path_ops GIN index
+_CONTENT_FILTER_CLAUSE = " AND content @> CAST(:content_filter AS jsonb)"
+
+# get_memories variants keyed by (memory_type given, content_filter given)
+_SELECT_MEMORIES = {
+    (False, False): text(_SELECT_MEMORY),
+    (True, False): text(_SELECT_MEMORY + _MEMORY_TYPE_CLAUSE),
+    (False, True): text(_SELECT_MEMORY + _CONTENT_FILTER_CLAUSE),
+    (True, True): text(_SELECT_MEMORY + _MEMORY_TYPE_CLAUSE + _CONTENT_FILTER_CLAUSE),
+}
+
+_INSERT_MSG = text("""
+INSERT INTO agent_communication (sender_id, receiver_id, message_type, content)
+VALUES (:sender_id, :receiver_id, :message_type, :content)
+RETURNING id
+""").bindparams(sa.bindparam("content", type_=JSONB))
+
+_SELECT_MSG_SENDER = text("""
+SELECT id, sender_id, receiver_id, message_type, content, created_at
+FROM agent_communication
+WHERE sender_id = :agent_id
+ORDER BY created_at DESC
+""")
+
+_SELECT_MSG_RECEIVER = text("""
+SELECT id, sender_id, receiver_id, message_type, content, created_at
+FROM agent_communication
+WHERE receiver_id = :agent_id
+ORDER BY created_at DESC
+""")
+
+# Served by ix_agent_memory_agent_content
+_MEMORY_CONTENT_EXISTS = text("""
+SELECT 1 FROM agent_memory
+WHERE agent_id = :agent_id AND content ->> :key = :value
+LIMIT 1
+""")
+
+_DELETE_AGENT_MEMORIES = text("DELETE FROM agent_memory WHERE agent_id = :agent_id")
+
+_DELETE_AGENT_MESSAGES = text("""
+DELETE FROM agent_communication
+WHERE sender_id = :agent_id OR receiver_id = :agent_id
+""")
+
 class MemoryService:
     def __init__(self):
-        self.engine = create_engine(os.getenv('DATABASE_URL'))
+        self.engine = get_engine(os.getenv('DATABASE_URL'))
         self.Session = sessionmaker(bind=self.engine)
 
+    def close(self) -> None:
+        """Close the pooled connections; the engine reconnects if used again."""
+        self.engine.dispose()
+
     def store_memory(self, agent_id: str, memory_type: str, content: Dict) -> int:
         """Store a memory for an agent."""
-        with self.Session() as session:
-            result = session.execute(
-                text("""
-                INSERT INTO agent_memory (agent_id, memory_type, content)
-                VALUES (:agent_id, :memory_type, :content)
-                RETURNING id
-                """),
-                {
-                    "agent_id": agent_id,
-                    "memory_type": memory_type,
-                    "content": json.dumps(content)
-                }
-            )
-            memory_id = result.scalar()
-            session.commit()
-            return memory_id
+        stmt = pg_insert(AGENT_MEMORY).values(
+            agent_id=agent_id,
+            memory_type=memory_type,
+            content=content
+        ).returning(AGENT_MEMORY.c.id)
+        with self.engine.begin() as conn:
+            return conn.execute(stmt).scalar_one()
+
+    def store_memories(self, memories: List[Dict]) -> List[int]:
+        """Store many memories and return their ids, in input order.
+
+        Each item needs agent_id, memory_type and content. The rows go out
+        as multi-VALUES INSERT ... RETURNING batches, so every id comes back
+        without a round-trip per row.
+        """
+        if not memories:
+            return []
+        stmt = pg_insert(AGENT_MEMORY).returning(
+            AGENT_MEMORY.c.id, sort_by_parameter_order=True
+        )
+        with self.engine.begin() as conn:
+            return conn.execute(stmt, memories).scalars().all()
+
+    def get_memories(self, agent_id: str, memory_type: Optional[str] = None,
+                     content_filter: Optional[Dict] = None) -> List[Mapping]:
+        """Retrieve memories for an agent, optionally matching a JSONB content subset."""
+        params = {"agent_id": agent_id}
+        if memory_type:
+            params["memory_type"] = memory_type
+        if content_filter:
+            params["content_filter"] = json.dumps(content_filter)
+        query = _SELECT_MEMORIES[bool(memory_type), bool(content_filter)]
 
-    def get_memories(self, agent_id: str, memory_type: Optional[str] = None) -> List[Dict]:
-        """Retrieve memories for an agent."""
         with self.Session() as session:
-            query = """
-            SELECT id, memory_type, content, created_at, updated_at
-            FROM agent_memory
-            WHERE agent_id = :agent_id
-            """
-            params = {"agent_id": agent_id}
-            
-            if memory_type:
-                query += " AND memory_type = :memory_type"
-                params["memory_type"] = memory_type
-            
-            result = session.execute(text(query), params)
-            return [dict(row) for row in result]
+            # content is JSONB, so the driver already hands back dicts
+            return session.execute(query, params).mappings().all()
+
+    def exists_with_content(self, agent_id: str, key: str, value: str) -> bool:
+        """Whether any of an agent's memories has content[key] == value.
+
+        Stops at the first match and returns no row data.
+        """
+        with self.engine.connect() as conn:
+            row = conn.execute(_MEMORY_CONTENT_EXISTS, {"agent_id": agent_id, "key": key, "value": value}).first()
+        return row is not None
 
     def send_message(self, sender_id: str, receiver_id: str, message_type: str, content: Dict) -> int:
         """Send a message between agents."""
         with self.Session() as session:
             result = session.execute(
-                text("""
-                INSERT INTO agent_communication (sender_id, receiver_id, message_type, content)
-                VALUES (:sender_id, :receiver_id, :message_type, :content)
-                RETURNING id
-                """),
+                _INSERT_MSG,
                 {
                     "sender_id": sender_id,
                     "receiver_id": receiver_id,
                     "message_type": message_type,
-                    "content": json.dumps(content)
+                    "content": content
                 }
             )
             message_id = result.scalar()
             session.commit()
             return message_id
 
-    def get_messages(self, agent_id: str, as_sender: bool = True) -> List[Dict]:
+    def get_messages(self, agent_id: str, as_sender: bool = True) -> List[Mapping]:
         """Retrieve messages for an agent."""
+        query = _SELECT_MSG_SENDER if as_sender else _SELECT_MSG_RECEIVER
         with self.Session() as session:
-            column = "sender_id" if as_sender else "receiver_id"
-            result = session.execute(
-                text(f"""
-                SELECT id, sender_id, receiver_id, message_type, content, created_at
-                FROM agent_communication
-                WHERE {column} = :agent_id
-                ORDER BY created_at DESC
-                """),
-                {"agent_id": agent_id}
-            )
-            return [dict(row) for row in result] 
\ No newline at end of file
+            return session.execute(query, {"agent_id": agent_id}).mappings().all() 
+
+    def delete_by_agent(self, agent_id: str) -> None:
+        """Delete an agent's memories and the messages it sent or received."""
+        with self.engine.begin() as conn:
+            conn.execute(_DELETE_AGENT_MEMORIES, {"agent_id": agent_id})
+            conn.execute(_DELETE_AGENT_MESSAGES, {"agent_id": agent_id})
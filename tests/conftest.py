@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # Windows has no uvloop; keep the default loop
+    uvloop = None
+
+class TeardownErrors(Exception):
+    """Cleanups that failed at the end of the session, reported together."""
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "perf: timing-sensitive test, skipped unless --run-perf is given")
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--run-perf", action="store_true", default=False,
+        help="run timing-sensitive tests marked perf",
+    )
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-perf"):
+        return
+    selected, deselected = [], []
+    for item in items:
+        (deselected if item.get_closest_marker("perf") else selected).append(item)
+    if deselected:
+        config.hook.pytest_deselected(items=deselected)
+        items[:] = selected
+
+@pytest.fixture(scope="session", autouse=True)
+def _uvloop():
+    """Run every event loop in the suite, TestClient's included, on uvloop."""
+    if uvloop is None:
+        yield
+        return
+    previous = asyncio.get_event_loop_policy()
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    yield
+    asyncio.set_event_loop_policy(previous)
+
+@pytest.fixture(scope="session")
+def query_latency():
+    """Per-query latency (ns) recorded by batch size, shared across tests."""
+    return {}
+
+@pytest.fixture(scope="session")
+def teardown_checks():
+    """(label, cleanup) pairs run once at session end, newest first.
+
+    Every cleanup runs even if an earlier one fails, so no client is left
+    holding sockets; the failures are raised together afterwards.
+    """
+    cleanups = []
+    yield cleanups
+    errors = []
+    for label, cleanup in reversed(cleanups):
+        try:
+            cleanup()
+        except Exception as e:
+            errors.append(f"{label}: {e!r}")
+    if errors:
+        raise TeardownErrors("\n".join(errors))
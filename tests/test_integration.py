@@ -1,29 +1,71 @@
 import pytest
+import pytest_asyncio
 import asyncio
+import time
+import numpy as np
+import orjson
+import httpx
 from fastapi.testclient import TestClient
+from sqlalchemy import event
 from shared.memory_sync.memory_service import MemoryService
 from shared.mcp.mcp_service import MCPService
-from shared.agent_bridge.bridge_service import AgentBridge
+from shared.agent_bridge.bridge_service import AgentBridge, decode_frame
 import os
 
-@pytest.fixture
-def memory_service():
-    return MemoryService()
+TEST_AGENT = "test_agent"
+TEST_INDEX = "test-index"
+
+# Shared, read-only test embedding (OpenAI embedding size)
+_TEST_VEC = np.full(1536, 0.1, dtype=np.float32)
+_TEST_VEC_BYTES = _TEST_VEC.tobytes()
+
+# Service clients (DB pool, Pinecone, Drive, Key Vault) are built once per
+# module; the function-scoped fixtures below reset their data between tests
+@pytest.fixture(scope="module")
+def memory_service(teardown_checks):
+    service = MemoryService()
+    teardown_checks.append(("memory: close pool", service.close))
+    return service
+
+@pytest.fixture(scope="module")
+def mcp_service(teardown_checks):
+    # MCP_BACKEND=faiss keeps vectors in process (needs faiss-cpu installed)
+    service = MCPService(backend=os.getenv("MCP_BACKEND", "pinecone"))
+    # Run newest first: the index is cleared before the clients close
+    teardown_checks.append(("mcp: close clients", service.close))
+    teardown_checks.append(("mcp: clear test index", lambda: service.delete_namespace(TEST_INDEX)))
+    return service
 
 @pytest.fixture
-def mcp_service():
-    return MCPService()
+def _reset_memory(memory_service):
+    # Requested by the tests that write test_agent's memories
+    try:
+        yield
+    finally:
+        memory_service.delete_by_agent(TEST_AGENT)
 
 @pytest.fixture
-def agent_bridge():
-    bridge = AgentBridge()
+def agent_bridge(memory_service, mcp_service):
+    # The bridge's queues and tasks belong to one event loop, so it stays
+    # per-test while sharing the module's service clients
+    bridge = AgentBridge(memory_service=memory_service, mcp_service=mcp_service)
     bridge.setup_routes()
     return bridge
 
 @pytest.fixture
 def client(agent_bridge):
+    # Only needed for websockets, which httpx doesn't speak; use
+    # async_client for HTTP routes
     return TestClient(agent_bridge.app)
 
+@pytest_asyncio.fixture
+async def async_client(agent_bridge):
+    # Requests run on the test's own event loop; no thread hop per call
+    transport = httpx.ASGITransport(app=agent_bridge.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bridge") as c:
+        yield c
+
+@pytest.mark.usefixtures("_reset_memory")
 def test_memory_service(memory_service):
     # Test storing memory
     memory_id = memory_service.store_memory(
@@ -39,62 +81,167 @@ def test_memory_service(memory_service):
     assert memories[0]["content"]["key"] == "value"
 
 def test_mcp_service(mcp_service):
-    # Test Google Drive integration
-    files = mcp_service.list_drive_files(os.getenv("DRIVE_CAMPAIGN_ROOT_ID"))
-    assert isinstance(files, list)
+    # Test Google Drive integration (no cloud clients with the faiss backend)
+    if mcp_service.backend != "faiss":
+        files = mcp_service.list_drive_files(os.getenv("DRIVE_CAMPAIGN_ROOT_ID"))
+        assert isinstance(files, list)
 
     # Test Pinecone integration
-    test_vector = [0.1] * 1536  # OpenAI embedding size
-    mcp_service.store_vector("test-index", [(1, test_vector)])
+    test_vector = _TEST_VEC
+    mcp_service.store_vector_bytes("test-index", np.array([1], dtype=np.int64), _TEST_VEC_BYTES)
     results = mcp_service.query_vector("test-index", test_vector)
-    assert isinstance(results, list)
+    assert isinstance(results.matches, list)
+
+    # Batched path
+    vectors = [(i, test_vector) for i in range(256)]
+    mcp_service.store_vectors("test-index", vectors)
+    results = mcp_service.query_vectors("test-index", [v for _, v in vectors[:20]])
+    assert len(results) == 20
 
 @pytest.mark.asyncio
-async def test_agent_bridge(agent_bridge, client):
+@pytest.mark.usefixtures("_reset_memory")
+async def test_agent_bridge(agent_bridge, client, async_client):
     # Test WebSocket connection
     with client.websocket_connect("/ws/test_agent") as websocket:
         # Send a message
-        websocket.send_json({
+        websocket.send_bytes(orjson.dumps({
             "type": "test_message",
             "content": "Hello, World!"
-        })
+        }))
         
         # Receive response
-        response = websocket.receive_json()
+        response = orjson.loads(websocket.receive_text())
         assert response["type"] == "test_message"
         assert response["content"] == "Hello, World!"
 
     # Test memory retrieval
-    response = client.get("/agents/test_agent/memories")
+    response = await async_client.get("/agents/test_agent/memories")
     assert response.status_code == 200
     memories = response.json()
     assert isinstance(memories, list)
 
-def test_full_integration(memory_service, mcp_service, agent_bridge, client):
-    # 1. Store memory
-    memory_id = memory_service.store_memory(
-        agent_id="test_agent",
-        memory_type="test",
-        content={"key": "value"}
-    )
+@pytest.mark.usefixtures("_reset_memory")
+def test_agent_bridge_sync_request(memory_service, client):
+    memory_service.store_memory("test_agent", "test", {"key": "value"})
 
-    # 2. Sync to cloud
-    mcp_service.sync_across_clouds(
-        source="memory",
-        destination="pinecone",
-        data={"memory_id": memory_id}
-    )
+    with client.websocket_connect("/ws/test_agent") as websocket:
+        websocket.send_bytes(orjson.dumps({"type": "sync_request"}))
+        (response,) = decode_frame(websocket.receive_text())
+        assert response["type"] == "sync_response"
+        assert {"key": "value"} in [m["content"] for m in response["memories"]]
+
+    # The response, created_at timestamps included, was persisted as JSONB
+    received = memory_service.get_messages("test_agent", as_sender=False)
+    assert [m["message_type"] for m in received] == ["sync_response"]
+
+QUERY_BATCH_SIZES = [1, 8, 64, 256]
+
+@pytest.mark.parametrize("batch_size", QUERY_BATCH_SIZES)
+def test_query_vectors_batched(mcp_service, query_latency, batch_size):
+    rng = np.random.default_rng(batch_size)
+    vecs = list(rng.random((batch_size, 1536), dtype=np.float32))
+
+    start = time.perf_counter_ns()
+    results = mcp_service.query_vectors("test-index", vecs, top_k=5)
+    elapsed = time.perf_counter_ns() - start
+
+    assert len(results) == batch_size
+    query_latency[batch_size] = elapsed / batch_size
+
+@pytest.mark.perf
+def test_query_batching_reduces_latency(query_latency):
+    # Runs after the parametrized cases above, in file order. Wall-clock
+    # ratios are noisy on shared runners, so this only runs with --run-perf;
+    # test_mcp_service_batches_vector_rpcs guards the RPC count in CI.
+    if not {QUERY_BATCH_SIZES[0], QUERY_BATCH_SIZES[-1]} <= query_latency.keys():
+        pytest.skip("batched query timings were not recorded")
+    assert query_latency[QUERY_BATCH_SIZES[-1]] < query_latency[QUERY_BATCH_SIZES[0]] * 0.3
 
-    # 3. Send message through bridge
-    response = client.post(
-        "/agents/test_agent/message",
-        json={
+class RecordingWebSocket:
+    def __init__(self):
+        self.frames = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, data):
+        self.frames.append(data)
+
+    async def send_bytes(self, data):
+        self.frames.append(data)
+
+@pytest.mark.asyncio
+async def test_agent_bridge_batches_frames(agent_bridge):
+    websocket = RecordingWebSocket()
+    await agent_bridge.connect(websocket, "batch_agent")
+
+    messages = [{"type": "test_message", "seq": i} for i in range(500)]
+    await agent_bridge.send_batch("batch_agent", messages)
+    await agent_bridge._outboxes["batch_agent"].join()
+    await agent_bridge.disconnect("batch_agent")
+
+    assert len(websocket.frames) <= 8
+    received = [m for frame in websocket.frames for m in decode_frame(frame)]
+    assert received == messages
+
+@pytest.mark.asyncio
+async def test_agent_bridge_compressed_broadcast(agent_bridge):
+    sockets = {"agent_a": RecordingWebSocket(), "agent_b": RecordingWebSocket()}
+    for agent_id, websocket in sockets.items():
+        await agent_bridge.connect(websocket, agent_id)
+
+    message = {"type": "announcement", "content": "Hello, agents!" * 50}
+    await agent_bridge.broadcast(message, compress=True)
+    for agent_id in sockets:
+        await agent_bridge._outboxes[agent_id].join()
+        await agent_bridge.disconnect(agent_id)
+
+    frame_a, = sockets["agent_a"].frames
+    frame_b, = sockets["agent_b"].frames
+    # Compressed once, the same buffer goes to every socket
+    assert frame_a is frame_b
+    assert decode_frame(frame_a) == [message]
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("_reset_memory")
+async def test_full_integration(memory_service, mcp_service, agent_bridge):
+    # 1. Store memories in one round-trip
+    memories = [
+        {"agent_id": "test_agent", "memory_type": "test", "content": {"key": f"value-{i}"}}
+        for i in range(5)
+    ]
+    inserts = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement)
+
+    event.listen(memory_service.engine, "before_cursor_execute", record)
+    try:
+        memory_ids = memory_service.store_memories(memories)
+    finally:
+        event.remove(memory_service.engine, "before_cursor_execute", record)
+    assert len(memory_ids) == len(memories)
+    assert all(memory_id is not None for memory_id in memory_ids)
+    assert len(inserts) == 1
+
+    # 2 + 3. Sync to cloud and deliver an agent message to the bridge; the
+    # two are independent, so their network round-trips overlap
+    await asyncio.gather(
+        mcp_service.sync_across_clouds_async(
+            source="memory",
+            destination="pinecone",
+            data={"memories": [
+                {"id": memory_id, "content": m["content"]}
+                for memory_id, m in zip(memory_ids, memories)
+            ]}
+        ),
+        agent_bridge.handle_message("test_agent", {
             "type": "test_message",
             "content": "Integration test"
-        }
+        })
     )
-    assert response.status_code == 200
 
-    # 4. Verify memory was stored
-    memories = memory_service.get_memories("test_agent")
-    assert any(m["content"].get("content") == "Integration test" for m in memories) 
\ No newline at end of file
+    # 4. Verify memory was stored once the queued write lands
+    await agent_bridge.flush_memories()
+    assert memory_service.exists_with_content("test_agent", "content", "Integration test") 
\ No newline at end of file
@@ -0,0 +1,36 @@
+import math
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from shared.mcp.mcp_service import MCPService, dequantize_int8, quantize_int8
+
+@pytest.fixture
+def mcp_service():
+    # The faiss backend builds no cloud clients; the index itself is mocked
+    return MCPService(backend="faiss")
+
+def test_mcp_service_batches_vector_rpcs(mcp_service):
+    index = mock.MagicMock()
+    index.query.side_effect = lambda queries, top_k: mock.Mock(results=[[]] * len(queries))
+    with mock.patch.object(mcp_service, "_index", return_value=index):
+        mcp_service.store_vectors("test-index", [(i, [0.1] * 1536) for i in range(256)])
+        results = mcp_service.query_vectors("test-index", [[0.1] * 1536] * 25)
+
+    assert index.upsert.call_count == math.ceil(256 / 100)
+    assert index.query.call_count == math.ceil(25 / 10)
+    assert len(results) == 25
+
+def test_int8_quantization_round_trip():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((64, 1536)).astype(np.float32)
+
+    codes, scales = quantize_int8(vectors)
+    restored = dequantize_int8(codes, scales)
+
+    assert codes.dtype == np.int8
+    cosine = (vectors * restored).sum(axis=1) / (
+        np.linalg.norm(vectors, axis=1) * np.linalg.norm(restored, axis=1)
+    )
+    assert cosine.min() >= 0.995
@@ -0,0 +1,82 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session
+
+from backend.models import Asset, Base, Campaign, Sensor, SensorMetrics, SensorStatus, Tag
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    return engine
+
+@pytest.fixture
+def count_queries(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+def test_sensor_metrics_load_without_n_plus_one(engine, count_queries):
+    now = datetime.now(timezone.utc)
+    with Session(engine) as session:
+        for i in range(5):
+            sensor = Sensor(
+                id=f"sensor-{i}",
+                tenant_id="scout",
+                name=f"Sensor {i}",
+                status=SensorStatus.OK,
+                last_run=now
+            )
+            sensor.metrics = [
+                SensorMetrics(
+                    id=f"metric-{i}-{j}",
+                    tenant_id="scout",
+                    accuracy=0.9,
+                    latency=10.0,
+                    throughput=100.0,
+                    timestamp=now
+                )
+                for j in range(3)
+            ]
+            session.add(sensor)
+        session.commit()
+
+    count_queries.clear()
+    with Session(engine) as session:
+        sensors = session.execute(select(Sensor)).scalars().all()
+        assert all(len(sensor.metrics) == 3 for sensor in sensors)
+
+    # One SELECT for sensors plus one batched SELECT for all their metrics
+    assert len(count_queries) <= 2
+
+def test_campaign_graph_loads_without_n_plus_one(engine, count_queries):
+    with Session(engine) as session:
+        tags = [Tag(name=f"tag-{i}") for i in range(3)]
+        for i in range(5):
+            campaign = Campaign(name=f"Campaign {i}", tags=tags[:2])
+            campaign.assets = [
+                Asset(name=f"Asset {i}-{j}", tags=tags[1:])
+                for j in range(2)
+            ]
+            session.add(campaign)
+        session.commit()
+
+    count_queries.clear()
+    with Session(engine) as session:
+        campaigns = session.execute(select(Campaign)).scalars().all()
+        assert all(len(campaign.tags) == 2 for campaign in campaigns)
+        assert all(
+            len(asset.tags) == 2
+            for campaign in campaigns
+            for asset in campaign.assets
+        )
+
+    # One SELECT for campaigns plus one per relationship level in the graph,
+    # however many campaigns and assets there are
+    assert len(count_queries) == 5